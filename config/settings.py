@@ -3,12 +3,43 @@ Configuration settings for the AI Compliance Agent
 Production-ready configuration with validation and environment variable support
 """
 
-from typing import Any, Dict, List, Optional
+import os
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
 from pydantic import Field, field_validator
+from pydantic.fields import FieldInfo
 import secrets
 
+# Environment snapshot used by the settings instance currently being built;
+# None means pydantic-settings reads os.environ directly.
+_ENVIRON: ContextVar[Optional[Dict[str, str]]] = ContextVar("settings_environ", default=None)
+
+
+class _MappingSettingsSource(PydanticBaseSettingsSource):
+    """Settings source that reads environment variables from a given mapping"""
+
+    def __init__(self, settings_cls: Type[BaseSettings], environ: Mapping[str, str]):
+        super().__init__(settings_cls)
+        # Settings are case-insensitive, so match variable names in lower case
+        self._environ = {key.lower(): value for key, value in environ.items()}
+
+    def get_field_value(self, field: FieldInfo, field_name: str) -> Tuple[Any, str, bool]:
+        return self._environ.get(field_name.lower()), field_name, self.field_is_complex(field)
+
+    def __call__(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for field_name, field in self.settings_cls.model_fields.items():
+            value, key, value_is_complex = self.get_field_value(field, field_name)
+            if value is None:
+                continue
+            # List fields arrive as JSON strings, as they do from os.environ
+            data[key] = self.decode_complex_value(field_name, field, value) if value_is_complex else value
+        return data
+
 
 class Settings(BaseSettings):
     """Application settings with environment variable support and validation"""
@@ -160,6 +191,25 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: Type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> Tuple[PydanticBaseSettingsSource, ...]:
+        """Read environment variables from the snapshot being built, if any
+
+        A snapshot is the only environment source: .env files are either
+        already merged into it by create_settings or deliberately skipped.
+        """
+        environ = _ENVIRON.get()
+        if environ is None:
+            return init_settings, env_settings, dotenv_settings, file_secret_settings
+        return init_settings, _MappingSettingsSource(settings_cls, environ), file_secret_settings
+
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -237,43 +287,91 @@ class Settings(BaseSettings):
         return missing
 
 
-def create_settings() -> Settings:
-    """Create settings instance with environment-specific configuration loading"""
-    import os
-    from pathlib import Path
-    from dotenv import load_dotenv
-    
+@lru_cache(maxsize=16)
+def _build_settings(environ: Tuple[Tuple[str, str], ...]) -> Settings:
+    """Build a Settings instance for an environment snapshot.
+
+    The snapshot is both the cache key and the only source of environment
+    values (no .env file is read here), so repeated calls with an unchanged
+    environment reuse the validated instance instead of re-running settings
+    validation.
+    """
+    token = _ENVIRON.set(dict(environ))
+    try:
+        return Settings()
+    finally:
+        _ENVIRON.reset(token)
+
+
+@lru_cache(maxsize=8)
+def _read_env_file(path: str) -> Dict[str, Optional[str]]:
+    """Parse a .env file once per process; later loads reuse the parsed values"""
+    from dotenv import dotenv_values
+
+    return dict(dotenv_values(path))
+
+
+def _apply_env_file(env_file: Path) -> None:
+    """Set variables from a .env file that are not already in the environment"""
+    for key, value in _read_env_file(str(env_file.resolve())).items():
+        if value is not None:
+            os.environ.setdefault(key, value)
+
+
+# APP_ENV the configuration banner was last printed for
+_reported_app_env: Optional[str] = None
+
+
+def _load_env_files() -> None:
+    """Load .env and .env.<APP_ENV> into os.environ and report key values
+
+    Each file is parsed once per process and the banner is only printed
+    again when APP_ENV changes, so repeated create_settings() calls stay cheap.
+    """
+    global _reported_app_env
+
+    # First, load base .env to get APP_ENV (without override to set defaults)
+    base_env_file = Path(".env")
+    base_exists = base_env_file.exists()
+    if base_exists:
+        _apply_env_file(base_env_file)
+
+    # Get APP_ENV from environment or command line
+    app_env = os.getenv("APP_ENV", "development")
+
+    # Determine which env file to load based on APP_ENV
+    # File naming: .env.development, .env.sit, .env.prd
+    env_file_path = f".env.{app_env}"
+    env_file = Path(env_file_path)
+
+    # Load environment-specific file WITHOUT override
+    # This allows K8s-injected env vars (or export commands) to take precedence
+    # File values only set defaults for missing variables
+    env_file_exists = env_file.exists()
+    if env_file_exists:
+        _apply_env_file(env_file)
+
+    if app_env == _reported_app_env:
+        return
+    _reported_app_env = app_env
+
     print("=" * 80)
     print("🔧 ENVIRONMENT CONFIGURATION LOADING")
     print("=" * 80)
     
-    # First, load base .env to get APP_ENV (without override to set defaults)
-    base_env_file = Path(".env")
-    if base_env_file.exists():
+    if base_exists:
         print(f"📄 Loading base configuration: .env")
-        load_dotenv(base_env_file, override=False)
         print(f"   ✅ Base .env loaded")
     else:
         print(f"   ⚠️  Base .env not found")
     
-    # Get APP_ENV from environment or command line
-    app_env = os.getenv("APP_ENV", "development")
     print(f"🌍 APP_ENV: {app_env}")
-    
-    # Determine which env file to load based on APP_ENV
-    # File naming: .env.development, .env.sit, .env.prd
-    env_file_path = f".env.{app_env}"
-    env_file = Path(env_file_path)
     print(f"📂 Looking for file: {env_file_path}")
     
-    # Load environment-specific file WITHOUT override
-    # This allows K8s-injected env vars (or export commands) to take precedence
-    # File values only set defaults for missing variables
-    if env_file.exists():
+    if env_file_exists:
         print(f"📄 Loading environment-specific configuration: {env_file_path}")
-        load_dotenv(env_file, override=False)
         print(f"   ✅ {env_file_path} loaded (sets defaults, K8s/export values take precedence)")
-    elif not base_env_file.exists():
+    elif not base_exists:
         print(f"   ⚠️  Neither {env_file_path} nor .env found, using defaults")
     else:
         print(f"   ℹ️  {env_file_path} not found, using base .env only")
@@ -323,9 +421,20 @@ def create_settings() -> Settings:
             print(f"   ⚠️  WARNING: Placeholder values detected! These will cause failures.")
             print(f"   ℹ️  For local testing, use .env.development or .env.sit instead.")
     print("=" * 80)
-    
-    # Create settings - Pydantic will read from os.environ which now has the correct overrides
-    return Settings()
+
+
+def create_settings(env: Optional[Mapping[str, str]] = None) -> Settings:
+    """Create settings instance with environment-specific configuration loading
+
+    When ``env`` is given, settings are read from that mapping alone and no
+    .env files are loaded.
+    """
+    if env is None:
+        _load_env_files()
+        # Pydantic reads os.environ, which now has the .env file defaults
+        env = os.environ
+    # Copy so one caller's changes do not leak into the cached instance
+    return _build_settings(tuple(sorted(env.items()))).model_copy(deep=True)
 
 
 # Global settings instance
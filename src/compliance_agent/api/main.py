@@ -225,6 +225,10 @@ async def lifespan(app: FastAPI):  # pragma: no cover
         except Exception as e:
             logger.error(f"❌ Error closing compliance engine: {e}")
 
+    # Close the remediation agent, if one was created for remediation requests
+    if remediation_router._remediation_agent is not None:
+        cleanup_tasks.append(remediation_router._remediation_agent.close())
+
     # Wait for cleanup with timeout
     if cleanup_tasks:
         try:
@@ -19,6 +19,18 @@ from src.compliance_agent.services.remediation_integration_service import Compli
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Customers with no activity for longer than this are treated as inactive
+INACTIVE_THRESHOLD_DAYS = 2 * 365
+
+# retention_limits entry that applies, keyed on (is_archived, inactive); archived
+# customers get the deletion limit regardless of activity
+_RETENTION_LIMIT_KEYS = {
+    (True, False): 'deleted_customer',
+    (True, True): 'deleted_customer',
+    (False, True): 'inactive_customer',
+    (False, False): 'customer_default',
+}
+
 @dataclass
 class ComplianceViolation:
     """Represents a compliance violation found in customer data."""
@@ -42,10 +54,18 @@ class CleanEDGPComplianceAgent:
     4. Focus on Customer table only
     """
     
-    def __init__(self):
-        self.db_service = EDGPDatabaseService()
-        self.ai_analyzer = AIComplianceAnalyzer()
-        self.remediation_service = ComplianceRemediationService()
+    def __init__(
+        self,
+        db_service: Optional[EDGPDatabaseService] = None,
+        ai_analyzer: Optional[AIComplianceAnalyzer] = None,
+        remediation_service: Optional[ComplianceRemediationService] = None
+    ):
+        # Services default to the real implementations; pass them in to substitute
+        self.db_service = db_service if db_service is not None else EDGPDatabaseService()
+        self.ai_analyzer = ai_analyzer if ai_analyzer is not None else AIComplianceAnalyzer()
+        self.remediation_service = (
+            remediation_service if remediation_service is not None else ComplianceRemediationService()
+        )
         
         # Data retention limits (in days)
         self.retention_limits = {
@@ -53,6 +73,9 @@ class CleanEDGPComplianceAgent:
             'inactive_customer': 3 * 365,  # 3 years for inactive
             'deleted_customer': 30,       # 30 days after deletion request
         }
+        
+        # Upper bound on customer analyses (and LLM calls) in flight at once
+        self.max_concurrent_analyses = 10
     
     async def initialize(self) -> bool:
         """Initialize all services."""
@@ -80,11 +103,15 @@ class CleanEDGPComplianceAgent:
             customers = await self.db_service.get_customers()
             logger.info(f"📊 Found {len(customers)} customers to analyze")
             
-            # 2. Analyze each customer for compliance violations
-            for customer in customers:
-                violation = await self._analyze_customer_retention(customer)
-                if violation:
-                    violations.append(violation)
+            # 2. Analyze customers concurrently for compliance violations
+            semaphore = asyncio.Semaphore(self.max_concurrent_analyses)
+            
+            async def analyze(customer):
+                async with semaphore:
+                    return await self._analyze_customer_retention(customer)
+            
+            results = await asyncio.gather(*(analyze(customer) for customer in customers))
+            violations = [violation for violation in results if violation]
             
             logger.info(f"⚠️  Found {len(violations)} compliance violations")
             
@@ -150,17 +177,8 @@ class CleanEDGPComplianceAgent:
     
     def _get_retention_limit(self, customer, last_activity_age: int) -> int:
         """Determine the applicable data retention limit for a customer."""
-        
-        # Check if customer is archived (equivalent to deletion requested)
-        if customer.is_archived:
-            return self.retention_limits['deleted_customer']
-        
-        # Check if customer is inactive (no activity for 2+ years)
-        if last_activity_age > (2 * 365):
-            return self.retention_limits['inactive_customer']
-        
-        # Default retention period
-        return self.retention_limits['customer_default']
+        key = _RETENTION_LIMIT_KEYS[(bool(customer.is_archived), last_activity_age > INACTIVE_THRESHOLD_DAYS)]
+        return self.retention_limits[key]
     
     async def _get_ai_violation_analysis(self, customer, data_age: int, retention_limit: int) -> Dict[str, str]:
         """
@@ -4,6 +4,8 @@ This module contains the main AI-powered compliance analysis engine.
 """
 
 import asyncio
+from bisect import bisect_right
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
@@ -31,6 +33,35 @@ class ComplianceEngine:
     across multiple frameworks and regulations.
     """
     
+    # Score penalty weight of a violation at each risk level
+    _SEVERITY_WEIGHTS = MappingProxyType({
+        RiskLevel.LOW: 1,
+        RiskLevel.MEDIUM: 3,
+        RiskLevel.HIGH: 7,
+        RiskLevel.CRITICAL: 15
+    })
+    
+    # Lower bounds of the MEDIUM, HIGH and CRITICAL risk score bands
+    _RISK_THRESHOLDS = (25, 50, 75)
+    _RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+    
+    # Mitigation measures, listed in the order they are reported
+    _BASE_MITIGATION_MEASURES = (
+        "Implement data minimization principles",
+        "Ensure transparent data processing through clear privacy notices",
+        "Establish procedures for handling data subject rights requests",
+        "Implement appropriate technical and organizational measures"
+    )
+    _HIGH_RISK_MITIGATION_MEASURES = (
+        "Conduct regular privacy audits and assessments",
+        "Implement privacy by design and by default",
+        "Establish data breach response procedures",
+        "Consider appointment of Data Protection Officer",
+        "Implement enhanced access controls and monitoring"
+    )
+    _CROSS_BORDER_MITIGATION_MEASURE = "Implement appropriate safeguards for international data transfers"
+    _AUTOMATED_DECISION_MITIGATION_MEASURE = "Implement measures to address automated decision-making risks"
+    
     def __init__(self):
         self.rule_engine = ComplianceRuleEngine()
         self.ai_analyzer = AIComplianceAnalyzer()
@@ -62,18 +93,19 @@ class ComplianceEngine:
         """
         logger.info(f"Assessing compliance for activity {activity.id} against {len(frameworks)} frameworks")
         
+        # Frameworks are independent, so overlap their rule checks and AI calls
+        results = await asyncio.gather(
+            *(self._assess_single_framework(activity, framework, include_ai_analysis) for framework in frameworks),
+            return_exceptions=True
+        )
+        
         assessments = []
         
-        for framework in frameworks:
-            try:
-                assessment = await self._assess_single_framework(
-                    activity, framework, include_ai_analysis
-                )
-                assessments.append(assessment)
-            except Exception as e:
-                logger.error(f"Error assessing {framework}: {str(e)}")
+        for framework, result in zip(frameworks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error assessing {framework}: {str(result)}")
                 # Create a failed assessment
-                assessment = ComplianceAssessment(
+                result = ComplianceAssessment(
                     id=f"{activity.id}_{framework}_{datetime.utcnow().isoformat()}",
                     framework=framework,
                     activity=activity,
@@ -81,9 +113,12 @@ class ComplianceEngine:
                     score=0.0,
                     assessor="ai_compliance_engine",
                     violations=[],
-                    recommendations=[f"Assessment failed: {str(e)}"]
+                    recommendations=[f"Assessment failed: {str(result)}"]
                 )
-                assessments.append(assessment)
+            elif isinstance(result, BaseException):
+                # Cancellation and interpreter exits are not assessment failures
+                raise result
+            assessments.append(result)
         
         return assessments
     
@@ -164,19 +199,10 @@ class ComplianceEngine:
         if not violations:
             return 100.0
         
-        # Weight violations by severity
-        severity_weights = {
-            RiskLevel.LOW: 1,
-            RiskLevel.MEDIUM: 3,
-            RiskLevel.HIGH: 7,
-            RiskLevel.CRITICAL: 15
-        }
-        
-        total_weight = sum(severity_weights[v.risk_level] for v in violations)
-        max_possible_weight = len(rules) * severity_weights[RiskLevel.CRITICAL]
-        
-        if max_possible_weight == 0:
-            return 100.0
+        # Weight violations by severity; rules is non-empty, so the maximum is positive
+        weights = self._SEVERITY_WEIGHTS
+        total_weight = sum([weights[v.risk_level] for v in violations])
+        max_possible_weight = len(rules) * weights[RiskLevel.CRITICAL]
         
         penalty = (total_weight / max_possible_weight) * 100
         score = max(0.0, 100.0 - penalty)
@@ -188,15 +214,11 @@ class ComplianceEngine:
         if not violations:
             return ComplianceStatus.COMPLIANT
         
-        critical_violations = [v for v in violations if v.risk_level == RiskLevel.CRITICAL]
-        high_violations = [v for v in violations if v.risk_level == RiskLevel.HIGH]
-        
-        if critical_violations:
+        # Any critical violation decides the outcome, so stop at the first one;
+        # every other mix of violations needs review
+        if any(v.risk_level == RiskLevel.CRITICAL for v in violations):
             return ComplianceStatus.NON_COMPLIANT
-        elif high_violations:
-            return ComplianceStatus.REQUIRES_REVIEW
-        else:
-            return ComplianceStatus.REQUIRES_REVIEW
+        return ComplianceStatus.REQUIRES_REVIEW
     
     def _generate_recommendations(
         self,
@@ -274,14 +296,7 @@ class ComplianceEngine:
     
     def _risk_score_to_level(self, score: float) -> RiskLevel:
         """Convert a risk score to a risk level"""
-        if score >= 75:
-            return RiskLevel.CRITICAL
-        elif score >= 50:
-            return RiskLevel.HIGH
-        elif score >= 25:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.LOW
+        return self._RISK_LEVELS[bisect_right(self._RISK_THRESHOLDS, score)]
     
     def _generate_mitigation_measures(
         self,
@@ -289,31 +304,25 @@ class ComplianceEngine:
         risk_level: RiskLevel
     ) -> List[str]:
         """Generate risk mitigation measures based on processing activities and risk level"""
-        measures = []
-        
         # Base measures for all risk levels
-        measures.extend([
-            "Implement data minimization principles",
-            "Ensure transparent data processing through clear privacy notices",
-            "Establish procedures for handling data subject rights requests",
-            "Implement appropriate technical and organizational measures"
-        ])
+        measures = list(self._BASE_MITIGATION_MEASURES)
         
         # Additional measures based on risk level
-        if risk_level in [RiskLevel.HIGH, RiskLevel.CRITICAL]:
-            measures.extend([
-                "Conduct regular privacy audits and assessments",
-                "Implement privacy by design and by default",
-                "Establish data breach response procedures",
-                "Consider appointment of Data Protection Officer",
-                "Implement enhanced access controls and monitoring"
-            ])
-        
-        # Activity-specific measures
-        if any(activity.cross_border_transfers for activity in activities):
-            measures.append("Implement appropriate safeguards for international data transfers")
-        
-        if any(activity.automated_decision_making for activity in activities):
-            measures.append("Implement measures to address automated decision-making risks")
-        
-        return measures
\ No newline at end of file
+        if risk_level in (RiskLevel.HIGH, RiskLevel.CRITICAL):
+            measures.extend(self._HIGH_RISK_MITIGATION_MEASURES)
+        
+        # Activity-specific measures, found in a single pass over the activities
+        cross_border = automated = False
+        for activity in activities:
+            cross_border = cross_border or activity.cross_border_transfers
+            automated = automated or activity.automated_decision_making
+            if cross_border and automated:
+                break
+        
+        if cross_border:
+            measures.append(self._CROSS_BORDER_MITIGATION_MEASURE)
+        
+        if automated:
+            measures.append(self._AUTOMATED_DECISION_MITIGATION_MEASURE)
+        
+        return measures
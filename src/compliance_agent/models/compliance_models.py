@@ -6,7 +6,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any
 
-from pydantic import BaseModel, Field, validator, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 
 class ComplianceFramework(str, Enum):
@@ -97,20 +97,19 @@ class DataProcessingActivity(BaseModel):
         if "cross_border_transfers" not in values and "cross_border_transfer" in values:
             values["cross_border_transfers"] = values.pop("cross_border_transfer")
 
-        list_fields = ["data_types", "legal_bases", "data_subjects", "recipients", "security_measures"]
+        list_fields = ["data_types", "data_subjects", "recipients", "security_measures"]
         for field in list_fields:
             if values.get(field) is None:
                 values[field] = []
 
-        return values
+        # Defaults are filled in here rather than in an after-validator, so each
+        # construction makes a single Python callback
+        if values.get("retention_period") is None:
+            values["retention_period"] = 0
+        if not values.get("legal_bases"):
+            values["legal_bases"] = ["unspecified"]
 
-    @model_validator(mode="after")
-    def _populate_defaults(self) -> "DataProcessingActivity":
-        if self.retention_period is None:
-            self.retention_period = 0
-        if not self.legal_bases:
-            self.legal_bases = ["unspecified"]
-        return self
+        return values
 
 
 class ComplianceRule(BaseModel):
@@ -163,9 +162,13 @@ class ComplianceViolation(BaseModel):
 
         identifier = values.get("rule_id") or values.get("violation_id") or values.get("id")
         if identifier:
-            values["rule_id"] = str(identifier)
-            values.setdefault("violation_id", str(identifier))
-            values.setdefault("id", str(identifier))
+            identifier = str(identifier)
+            values["rule_id"] = identifier
+            # Aliases fall back to the rule id when absent or empty
+            if not values.get("violation_id"):
+                values["violation_id"] = identifier
+            if not values.get("id"):
+                values["id"] = identifier
 
         risk = values.get("risk_level")
         if isinstance(risk, str):
@@ -182,12 +185,6 @@ class ComplianceViolation(BaseModel):
 
         return values
 
-    @model_validator(mode="after")
-    def _ensure_aliases(self) -> "ComplianceViolation":
-        self.id = self.id or self.rule_id
-        self.violation_id = self.violation_id or self.rule_id
-        return self
-
 
 class ComplianceAssessment(BaseModel):
     """Model representing a compliance assessment result"""
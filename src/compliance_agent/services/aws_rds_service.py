@@ -4,14 +4,53 @@ Supports AWS Secrets Manager for secure credential management
 Used when EDGP_DB_SECRET_NAME is configured or AWS RDS connection is detected
 """
 
+import asyncio
 import logging
 import json
-from typing import Dict, Any, Optional
+import time
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, TypedDict, Union
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+try:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    # keep catching the stdlib exception either way
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Secrets are cached per (region, secret name) across manager instances, since
+# resolve_credentials builds a fresh AWSSecretsManager for every connection
+SECRET_CACHE_TTL_SECONDS = 300
+_secret_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+# Concurrent lookups share one client, so widen its connection pool; TCP
+# keepalive lets the OS notice idle pooled connections that were dropped
+_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+)
+# Fetches currently in flight, so concurrent callers share one RPC. Each task
+# belongs to the loop that started it; get_secret replaces tasks from any
+# other (possibly closed) loop rather than awaiting them.
+_inflight_fetches: Dict[Tuple[str, str], 'asyncio.Task[Dict[str, Any]]'] = {}
+
+
+def _forget_fetch(key: Tuple[str, str], fetch: 'asyncio.Task[Dict[str, Any]]') -> None:
+    """Drop a finished fetch, unless a newer one has already replaced it"""
+    if _inflight_fetches.get(key) is fetch:
+        del _inflight_fetches[key]
+
+
+@lru_cache(maxsize=8)
+def _build_client(region_name: str):
+    """Build one Secrets Manager client per region, shared by all managers"""
+    return boto3.client('secretsmanager', region_name=region_name, config=_CLIENT_CONFIG)
+
 
 class AWSSecretsManager:
     """Service for retrieving database credentials from AWS Secrets Manager"""
@@ -23,18 +62,30 @@ class AWSSecretsManager:
     def _get_client(self):
         """Get or create Secrets Manager client"""
         if not self.client:
-            self.client = boto3.client(
-                'secretsmanager',
-                region_name=self.region_name
-            )
+            self.client = _build_client(self.region_name)
         return self.client
     
-    async def get_secret(self, secret_name: str) -> Dict[str, Any]:
+    @staticmethod
+    def clear_cache():
+        """Clear the cached secrets for all regions"""
+        _secret_cache.clear()
+        logger.info("Cleared database secrets cache")
+    
+    def _get_cached(self, secret_name: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached secret that is still within its TTL"""
+        cached = _secret_cache.get((self.region_name, secret_name))
+        if cached and time.monotonic() - cached[0] < SECRET_CACHE_TTL_SECONDS:
+            logger.debug(f"Using cached secret for: {secret_name}")
+            return dict(cached[1])
+        return None
+    
+    async def get_secret(self, secret_name: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Retrieve database credentials from AWS Secrets Manager
         
         Args:
             secret_name: Name of the secret in AWS Secrets Manager
+            use_cache: Whether to use a cached value younger than SECRET_CACHE_TTL_SECONDS
             
         Returns:
             Dictionary containing database credentials
@@ -42,15 +93,37 @@ class AWSSecretsManager:
         Raises:
             ClientError: If secret cannot be retrieved
         """
+        if use_cache:
+            cached = self._get_cached(secret_name)
+            if cached is not None:
+                return cached
+        
+        key = (self.region_name, secret_name)
+        loop = asyncio.get_running_loop()
+        fetch = _inflight_fetches.get(key)
+        if fetch is None or fetch.get_loop() is not loop:
+            fetch = loop.create_task(self._fetch_secret(secret_name))
+            _inflight_fetches[key] = fetch
+            fetch.add_done_callback(lambda done: _forget_fetch(key, done))
+        
+        # Shield the shared fetch so one cancelled caller doesn't cancel it for the rest
+        return dict(await asyncio.shield(fetch))
+    
+    async def _fetch_secret(self, secret_name: str) -> Dict[str, Any]:
+        """Fetch a secret off the event loop and cache the parsed result"""
         try:
             client = self._get_client()
             
             logger.info(f"Retrieving secret: {secret_name}")
-            response = client.get_secret_value(SecretId=secret_name)
+            # boto3 is blocking, so run the call in a worker thread
+            response = await asyncio.to_thread(client.get_secret_value, SecretId=secret_name)
             
             # Parse the secret value
             secret_string = response['SecretString']
-            secret_dict = json.loads(secret_string)
+            secret_dict = _json_loads(secret_string)
+            
+            # Cache the result
+            _secret_cache[(self.region_name, secret_name)] = (time.monotonic(), secret_dict)
             
             logger.info("Successfully retrieved database credentials from Secrets Manager")
             return secret_dict
@@ -79,6 +152,39 @@ class AWSSecretsManager:
             raise e
 
 
+class RDSConnectionConfig(TypedDict, total=False):
+    """Connection settings passed straight through to aiomysql.create_pool"""
+    host: str
+    port: int
+    db: str
+    user: str
+    password: str
+    charset: str
+    autocommit: bool
+    connect_timeout: int
+    # Secrets Manager keys, removed again by resolve_credentials
+    secret_name: str
+    region: str
+    use_secrets_manager: bool
+
+
+# Connection settings shared by every RDS config, frozen so callers can't alter them
+_DEFAULT_CONFIG = MappingProxyType({
+    'charset': 'utf8mb4',
+    'autocommit': True,
+    'connect_timeout': 60
+})
+
+
+class SecretPayload(TypedDict, total=False):
+    """Fields read from an RDS credentials secret"""
+    username: str
+    password: str
+    host: str
+    # Secrets Manager's RDS template stores the port as a string or a number
+    port: Union[str, int]
+
+
 class AWSRDSConfig:
     """Configuration builder for AWS RDS connections"""
     
@@ -92,7 +198,7 @@ class AWSRDSConfig:
         secret_name: Optional[str] = None,
         region: str = "ap-southeast-1",
         use_secrets_manager: bool = False
-    ) -> Dict[str, Any]:
+    ) -> RDSConnectionConfig:
         """
         Build database connection configuration for AWS RDS
         
@@ -110,13 +216,11 @@ class AWSRDSConfig:
             Dictionary with connection configuration
         """
         
-        config = {
+        config: RDSConnectionConfig = {
             'host': host,
             'port': port,
             'db': database,
-            'charset': 'utf8mb4',
-            'autocommit': True,
-            'connect_timeout': 60
+            **_DEFAULT_CONFIG
         }
         
         if use_secrets_manager and secret_name:
@@ -136,7 +240,7 @@ class AWSRDSConfig:
         return config
     
     @staticmethod
-    async def resolve_credentials(config: Dict[str, Any]) -> Dict[str, Any]:
+    async def resolve_credentials(config: RDSConnectionConfig) -> RDSConnectionConfig:
         """
         Resolve database credentials from AWS Secrets Manager if needed
         
@@ -157,18 +261,21 @@ class AWSRDSConfig:
         
         # Get credentials from Secrets Manager
         secrets_manager = AWSSecretsManager(region)
-        credentials = await secrets_manager.get_secret(secret_name)
+        credentials: SecretPayload = await secrets_manager.get_secret(secret_name)
+        get = credentials.get
         
         # Update config with retrieved credentials
-        resolved_config = config.copy()
-        resolved_config['user'] = credentials.get('username')
-        resolved_config['password'] = credentials.get('password')
+        resolved_config: RDSConnectionConfig = config.copy()
+        resolved_config['user'] = get('username')
+        resolved_config['password'] = get('password')
         
         # Also update host and port if they come from secrets manager
-        if credentials.get('host'):
-            resolved_config['host'] = credentials.get('host')
-        if credentials.get('port'):
-            resolved_config['port'] = int(credentials.get('port'))
+        host = get('host')
+        if host:
+            resolved_config['host'] = host
+        port = get('port')
+        if port:
+            resolved_config['port'] = port if type(port) is int else int(port)
         
         # Remove secrets manager specific keys from final config
         resolved_config.pop('secret_name', None)
@@ -179,11 +286,15 @@ class AWSRDSConfig:
         return resolved_config
 
 
+_REQUIRED_CONFIG_FIELDS = ('host', 'port', 'db')
+_VALID_PORTS = range(1, 65536)
+
+
 class RDSConnectionValidator:
     """Utility for validating RDS connections"""
     
     @staticmethod
-    def validate_config(config: Dict[str, Any]) -> bool:
+    def validate_config(config: RDSConnectionConfig) -> bool:
         """
         Validate RDS connection configuration
         
@@ -196,22 +307,22 @@ class RDSConnectionValidator:
         Raises:
             ValueError: If configuration is invalid
         """
-        required_fields = ['host', 'port', 'db']
-        
-        for field in required_fields:
-            if not config.get(field):
+        get = config.get
+        for field in _REQUIRED_CONFIG_FIELDS:
+            if not get(field):
                 raise ValueError(f"Missing required field: {field}")
         
         # Check if credentials are provided
-        has_direct_creds = config.get('user') and config.get('password')
-        has_secrets_manager = config.get('use_secrets_manager') and config.get('secret_name')
+        has_direct_creds = get('user') and get('password')
+        has_secrets_manager = get('use_secrets_manager') and get('secret_name')
         
         if not has_direct_creds and not has_secrets_manager:
             raise ValueError("Must provide either direct credentials or Secrets Manager configuration")
         
-        # Validate port range
-        port = config.get('port')
-        if not isinstance(port, int) or port < 1 or port > 65535:
+        # Validate port range (presence was checked above)
+        port = config['port']
+        # Exact type check, so bools (an int subclass) are rejected too
+        if type(port) is not int or port not in _VALID_PORTS:
             raise ValueError(f"Invalid port number: {port}")
         
         logger.info("RDS configuration validation passed")
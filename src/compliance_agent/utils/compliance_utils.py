@@ -3,10 +3,20 @@ Standalone compliance utilities for testing without external dependencies.
 """
 import re
 import json
+from collections import Counter
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 
 
+# PII patterns, compiled once at import since masking runs on every log line
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}')
+_ID_RE = re.compile(r'\b\d{6,12}\b')
+# Keys are masked when their name contains any of these words, e.g. "api_key"
+_SENSITIVE_KEY_RE = re.compile('password|token|secret|key|email|phone', re.IGNORECASE)
+
+
 def mask_pii_data(text: str) -> str:
     """
     Mask PII data in text for compliance logging.
@@ -17,47 +27,86 @@ def mask_pii_data(text: str) -> str:
     Returns:
         Text with PII data masked
     """
+    # Ordered passes rather than one alternation: emails are masked across the
+    # whole string before the phone pattern can claim their digit-led local parts
     # Email masking
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    text = re.sub(email_pattern, '***@***.***', text)
+    text = _EMAIL_RE.sub('***@***.***', text)
     
     # Phone number masking
-    phone_pattern = r'\+?\d{1,4}?[-.\s]?\(?\d{1,3}?\)?[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}'
-    text = re.sub(phone_pattern, '+***-***-****', text)
+    text = _PHONE_RE.sub('+***-***-****', text)
     
     # ID number masking (simple pattern)
-    id_pattern = r'\b\d{6,12}\b'
-    text = re.sub(id_pattern, '***ID***', text)
+    text = _ID_RE.sub('***ID***', text)
     
     return text
 
 
-def validate_consent_date(consent_date: str, retention_days: int = 365) -> Tuple[bool, str]:
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 string in one fromisoformat call, accepting a trailing 'Z'"""
+    # fromisoformat only understands 'Z' from Python 3.11
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+
+def validate_consent_date(
+    consent_date: str,
+    retention_days: int = 365,
+    now: Optional[datetime] = None
+) -> Tuple[bool, str]:
     """
     Validate if consent date is within retention period.
     
     Args:
         consent_date: ISO format date string
         retention_days: Number of days for retention
+        now: Reference time; pass one value when validating many records
+            to read the clock once. Defaults to the current local time.
         
     Returns:
         Tuple of (is_valid, message)
     """
+    if now is None:
+        now = datetime.now()
     try:
-        consent_dt = datetime.fromisoformat(consent_date.replace('Z', '+00:00'))
-        current_dt = datetime.now()
-        retention_period = timedelta(days=retention_days)
-        
-        is_valid = (current_dt - consent_dt) <= retention_period
-        
-        if is_valid:
-            return True, "Consent is within retention period"
-        else:
-            days_expired = (current_dt - consent_dt).days - retention_days
-            return False, f"Consent expired {days_expired} days ago"
-            
-    except (ValueError, TypeError) as e:
+        consent = _parse_iso_datetime(consent_date)
+        # Only mixed naive (local) and offset-aware values need normalising;
+        # two naive values keep plain wall-clock arithmetic
+        if (consent.tzinfo is None) != (now.tzinfo is None):
+            consent, now = consent.astimezone(), now.astimezone()
+    except (ValueError, TypeError, OverflowError, OSError) as e:
         return False, f"Invalid consent date format: {e}"
+    
+    cutoff = now - timedelta(days=retention_days)
+    if consent >= cutoff:
+        return True, "Consent is within retention period"
+    else:
+        days_expired = (cutoff - consent).days
+        return False, f"Consent expired {days_expired} days ago"
+
+
+# Framework implied by each known country / region, checked in priority order
+_COUNTRY_FRAMEWORKS = {
+    'singapore': 'PDPA', 'sg': 'PDPA',
+    'germany': 'GDPR', 'france': 'GDPR', 'italy': 'GDPR',
+    'spain': 'GDPR', 'netherlands': 'GDPR', 'belgium': 'GDPR',
+    'usa': 'CCPA',
+}
+_REGION_FRAMEWORKS = {
+    'apac': 'PDPA', 'asia-pacific': 'PDPA',
+    'eu': 'GDPR', 'europe': 'GDPR',
+    'california': 'CCPA', 'ca': 'CCPA',
+}
+_FRAMEWORK_PRIORITY = ('PDPA', 'GDPR', 'CCPA')
+
+
+@lru_cache(maxsize=256)
+def _detect_framework(country: str, region: str) -> str:
+    candidates = (_COUNTRY_FRAMEWORKS.get(country), _REGION_FRAMEWORKS.get(region))
+    for framework in _FRAMEWORK_PRIORITY:
+        if framework in candidates:
+            return framework
+    return 'Generic'
 
 
 def detect_compliance_framework(data: Dict[str, Any]) -> str:
@@ -70,23 +119,7 @@ def detect_compliance_framework(data: Dict[str, Any]) -> str:
     Returns:
         Compliance framework name
     """
-    country = data.get('country', '').lower()
-    region = data.get('region', '').lower()
-    
-    # PDPA detection (Singapore and similar)
-    if country in ['singapore', 'sg'] or region in ['apac', 'asia-pacific']:
-        return 'PDPA'
-    
-    # GDPR detection (EU countries)
-    eu_countries = ['germany', 'france', 'italy', 'spain', 'netherlands', 'belgium']
-    if country in eu_countries or region in ['eu', 'europe']:
-        return 'GDPR'
-    
-    # CCPA detection (California)
-    if region in ['california', 'ca'] or country == 'usa':
-        return 'CCPA'
-    
-    return 'Generic'
+    return _detect_framework(data.get('country', '').lower(), data.get('region', '').lower())
 
 
 def generate_compliance_report(violations: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -99,24 +132,18 @@ def generate_compliance_report(violations: List[Dict[str, Any]]) -> Dict[str, An
     Returns:
         Compliance report dictionary
     """
+    # Tally types and severities in C rather than with per-violation dict updates
+    severities = Counter(violation.get('severity', 'medium') for violation in violations)
+    
     report = {
         'timestamp': datetime.now().isoformat(),
         'total_violations': len(violations),
-        'violation_types': {},
-        'severity_breakdown': {'high': 0, 'medium': 0, 'low': 0},
+        'violation_types': dict(Counter(violation.get('type', 'unknown') for violation in violations)),
+        # Only the known levels are reported; unrecognised severities are dropped
+        'severity_breakdown': {level: severities[level] for level in ('high', 'medium', 'low')},
         'recommendations': []
     }
     
-    for violation in violations:
-        # Count violation types
-        violation_type = violation.get('type', 'unknown')
-        report['violation_types'][violation_type] = report['violation_types'].get(violation_type, 0) + 1
-        
-        # Count severity levels
-        severity = violation.get('severity', 'medium')
-        if severity in report['severity_breakdown']:
-            report['severity_breakdown'][severity] += 1
-    
     # Generate recommendations
     if report['severity_breakdown']['high'] > 0:
         report['recommendations'].append('Immediate action required for high-severity violations')
@@ -134,27 +161,39 @@ def sanitize_log_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Sanitize data for logging by removing or masking sensitive information.
     
+    Nested dicts (including dicts inside lists) are walked with an explicit
+    work-list, so arbitrarily deep payloads don't hit the recursion limit.
+    
     Args:
         data: Dictionary containing data to be logged
         
     Returns:
         Sanitized data dictionary
     """
-    sanitized = {}
+    sanitized: Dict[str, Any] = {}
+    pending = [(data, sanitized)]
     
-    sensitive_keys = ['password', 'token', 'secret', 'key', 'email', 'phone']
-    
-    for key, value in data.items():
-        if any(sensitive in key.lower() for sensitive in sensitive_keys):
-            sanitized[key] = '***MASKED***'
-        elif isinstance(value, str):
-            sanitized[key] = mask_pii_data(value)
-        elif isinstance(value, dict):
-            sanitized[key] = sanitize_log_data(value)
-        elif isinstance(value, list):
-            sanitized[key] = [sanitize_log_data(item) if isinstance(item, dict) else item for item in value]
-        else:
-            sanitized[key] = value
+    while pending:
+        source, target = pending.pop()
+        for key, value in source.items():
+            if _SENSITIVE_KEY_RE.search(key):
+                target[key] = '***MASKED***'
+            elif isinstance(value, str):
+                target[key] = mask_pii_data(value)
+            elif isinstance(value, dict):
+                target[key] = child = {}
+                pending.append((value, child))
+            elif isinstance(value, list):
+                target[key] = items = []
+                for item in value:
+                    if isinstance(item, dict):
+                        child = {}
+                        pending.append((item, child))
+                        items.append(child)
+                    else:
+                        items.append(item)
+            else:
+                target[key] = value
     
     return sanitized
 
@@ -171,8 +210,7 @@ def calculate_retention_expiry(created_date: str, retention_period_days: int) ->
         ISO format date string for expiry date
     """
     try:
-        created_dt = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-        expiry_dt = created_dt + timedelta(days=retention_period_days)
+        expiry_dt = _parse_iso_datetime(created_date) + timedelta(days=retention_period_days)
         return expiry_dt.isoformat()
     except (ValueError, TypeError):
         # If date parsing fails, return a default expiry
@@ -191,13 +229,13 @@ def validate_data_structure(data: Dict[str, Any], required_fields: List[str]) ->
     Returns:
         Tuple of (is_valid, list_of_missing_fields)
     """
-    missing_fields = []
-    
-    for field in required_fields:
-        if field not in data or data[field] is None or data[field] == '':
-            missing_fields.append(field)
+    # One dict lookup per required field; absent keys read as None
+    missing_fields = [
+        field for field in required_fields
+        if (value := data.get(field)) is None or value == ''
+    ]
     
-    return len(missing_fields) == 0, missing_fields
+    return not missing_fields, missing_fields
 
 
 def format_compliance_timestamp(dt: Optional[datetime] = None) -> str:
@@ -5,12 +5,16 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import queue
+import re
 import smtplib
 import sqlite3
+import threading
 import uuid
 from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 
@@ -29,12 +33,308 @@ from src.compliance_agent.models.compliance_models import ComplianceViolation
 logger = logging.getLogger(__name__)
 
 
+# Named keyword patterns, searched one by one so a keyword embedded in
+# another (e.g. "erase" inside "messagerase") still counts
+_KeywordPatterns = Tuple[Tuple[str, "re.Pattern[str]"], ...]
+
+
+def _keyword_pattern(**groups: str) -> _KeywordPatterns:
+    """Compile each named keyword alternation into a case-insensitive pattern."""
+    return tuple((name, re.compile(alternation, re.I)) for name, alternation in groups.items())
+
+
+@lru_cache(maxsize=1024)
+def _matched_kinds(patterns: _KeywordPatterns, action: str) -> frozenset:
+    """Return the names of every keyword group that occurs in ``action``.
+
+    Memoised because workflows retried for the same violation rebuild step
+    parameters from the same action strings; callers still get fresh dicts.
+    """
+    return frozenset(name for name, pattern in patterns if pattern.search(action))
+
+
+def _first_kind(patterns: _KeywordPatterns, priority: tuple, action: str) -> str:
+    """Return the highest priority keyword group found in ``action``."""
+    found = _matched_kinds(patterns, action)
+    return next((kind for kind in priority if kind in found), "default")
+
+
+_ACTION_TYPE_PATTERN = _keyword_pattern(
+    approval="approve|approval|authorize",
+    delete="delete|remove|purge|erase",
+    email="email|notify|message|inform",
+    review="review|policy|legal|audit|consent",
+    stop="stop|halt",
+)
+_ACTION_TYPE_PRIORITY = ("approval", "delete", "email", "review", "stop")
+
+_EMAIL_PATTERN = _keyword_pattern(
+    confirm="confirm|deletion",
+    delete="delete",
+    notify="notify|stakeholder",
+)
+
+_HUMAN_TASK_PATTERN = _keyword_pattern(legal="legal", policy="policy|update", consent="consent")
+_HUMAN_TASK_PRIORITY = ("legal", "policy", "consent")
+_HUMAN_TASK_TEMPLATES: Dict[str, tuple] = {
+    "legal": ("legal_review", "legal_counsel", "high"),
+    "policy": ("policy_update", "compliance_officer", "medium"),
+    "consent": ("consent_update", "data_steward", "medium"),
+    "default": ("manual_task", "operations_team", "medium"),
+}
+
+_APPROVAL_PATTERN = _keyword_pattern(policy="policy")
+_APPROVAL_TEMPLATES: Dict[str, tuple] = {
+    "policy": ("policy_change", "compliance_officer", True),
+    "default": ("data_deletion", "data_protection_officer", False),
+}
+
+_API_CALL_PATTERN = _keyword_pattern(stop="stop|halt", update="update|modify")
+_API_CALL_PRIORITY = ("stop", "update")
+_API_CALL_ROUTES: Dict[str, tuple] = {
+    "stop": ("stop", "POST"),
+    "update": ("update", "PUT"),
+    "default": ("action", "POST"),
+}
+
+_DATABASE_PATTERN = _keyword_pattern(delete="delete|remove")
+_BACKUP_PATTERN = _keyword_pattern(backup="backup")
+
+# Base step durations in minutes, adjusted in _estimate_step_duration for long
+# or backup-bearing actions.
+_STEP_DURATIONS: Dict[str, int] = {
+    "api_call": 5,
+    "database_operation": 15,
+    "email_notification": 8,
+    "human_task": 120,
+    "human_review": 90,
+    "human_approval": 30,
+}
+_DEFAULT_STEP_DURATION = 12
+
+
+class _SMTPPool:
+    """Small pool of open SMTP connections reused across notification steps.
+
+    Connections are opened lazily on a pool miss and returned after a
+    successful send; a connection that fails mid-send is shut down instead.
+    Idle connections are probed with NOOP before reuse, so one the server
+    has since dropped is replaced before any mail is sent on it. A send is
+    never retried once it has started, which could deliver the mail twice.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        size: int = 4,
+        connect: Optional[Callable[[str], smtplib.SMTP]] = None,
+    ) -> None:
+        self._host = host
+        self._connect = connect
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue(maxsize=size)
+
+    def send_message(self, message: EmailMessage) -> None:
+        smtp = self._acquire()
+        try:
+            smtp.send_message(message)
+        except Exception:
+            self.discard(smtp)
+            raise
+        self.release(smtp)
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return (self._connect or smtplib.SMTP)(self._host)
+            try:
+                healthy = smtp.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                healthy = False
+            if healthy:
+                return smtp
+            # Servers close idle connections; try the next one
+            self.discard(smtp)
+
+    def release(self, smtp: smtplib.SMTP) -> None:
+        try:
+            self._idle.put_nowait(smtp)
+        except queue.Full:
+            self.discard(smtp)
+
+    def discard(self, smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            # The connection is already gone; just release the socket
+            smtp.close()
+
+    def close(self) -> None:
+        """Shut down every idle connection in the pool."""
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self.discard(smtp)
+
+
+_SMTP_POOL = _SMTPPool()
+
+
+class _TemplateData(dict):
+    """Template context that renders missing fields as empty strings."""
+
+    def __missing__(self, key: str) -> str:
+        return ""
+
+
+# Email bodies keyed by the ``template`` name set in _create_email_parameters;
+# unknown templates fall back to the raw JSON payload.
+_EMAIL_TEMPLATES: Dict[str, str] = {
+    "remediation_update": (
+        "A remediation update is available for violation {violation_id}.\n\n{message}\n"
+    ),
+    "deletion_confirmation": (
+        "Personal data linked to violation {violation_id} has been scheduled for deletion.\n\n{message}\n"
+    ),
+}
+
+# One SQLite connection per thread; sqlite3 keeps a per-connection cache of
+# compiled statements, so repeated remediation queries skip re-parsing too.
+# The in-memory database therefore persists across workflows run on the same
+# thread until _close_db_connection() discards it.
+_DB_LOCAL = threading.local()
+
+
+def _open_db() -> sqlite3.Connection:
+    return sqlite3.connect(":memory:")
+
+
+def _db_connection() -> sqlite3.Connection:
+    connection = getattr(_DB_LOCAL, "connection", None)
+    if connection is None:
+        connection = _open_db()
+        _DB_LOCAL.connection = connection
+    return connection
+
+
+def _close_db_connection() -> None:
+    """Close this thread's SQLite connection; the next query starts a fresh database."""
+    connection = getattr(_DB_LOCAL, "connection", None)
+    if connection is not None:
+        _DB_LOCAL.connection = None
+        connection.close()
+
+
+_WORKFLOW_TEMPLATES: Dict[RemediationType, List[Dict[str, Any]]] = {
+    RemediationType.AUTOMATIC: [
+        {
+            "name": "Data analysis",
+            "description": "Assess impact and scope",
+            "action_type": "api_call",
+            "parameters": {"endpoint": "https://api.example.com/analyse", "method": "POST"},
+            "duration": 10,
+        },
+        {
+            "name": "Validate prerequisites",
+            "description": "Ensure environment is ready",
+            "action_type": "validate_prerequisites",
+            "duration": 8,
+        },
+    ],
+    RemediationType.HUMAN_IN_LOOP: [
+        {
+            "name": "Human review",
+            "description": "Compliance team reviews remediation plan",
+            "action_type": "human_review",
+            "requires_human_approval": True,
+            "step_type": "manual",
+            "duration": 60,
+        },
+    ],
+    RemediationType.MANUAL_ONLY: [
+        {
+            "name": "Initial coordination",
+            "description": "Assign manual remediation tasks",
+            "action_type": "human_task",
+            "step_type": "manual",
+            "duration": 45,
+        }
+    ],
+}
+
+_WORKFLOW_TYPES: Dict[RemediationType, WorkflowType] = {
+    RemediationType.AUTOMATIC: WorkflowType.AUTOMATIC,
+    RemediationType.HUMAN_IN_LOOP: WorkflowType.HUMAN_IN_LOOP,
+    RemediationType.MANUAL_ONLY: WorkflowType.MANUAL_ONLY,
+}
+
+_APPROVAL_REMEDIATION_TYPES = frozenset({RemediationType.HUMAN_IN_LOOP, RemediationType.MANUAL_ONLY})
+_SENSITIVE_ACTION_KEYWORDS = ("delete", "legal", "approval", "policy", "sensitive")
+
+# Remediation types that must open with a human approval step, mapped to the
+# injector method by name like _STEP_HANDLERS; any other type returns the
+# generated steps untouched.
+_APPROVAL_INJECTORS: Dict[RemediationType, str] = {
+    remediation_type: "_inject_approval_step" for remediation_type in _APPROVAL_REMEDIATION_TYPES
+}
+
+# Step handlers are looked up by name so that patching an agent method still
+# takes effect for the step types it handles.
+_STEP_HANDLERS: Dict[str, str] = {
+    "api_call": "_run_api_call",
+    "database_operation": "_execute_database_step",
+    "email_notification": "_send_email_step",
+    "human_approval": "_create_approval_task",
+    "human_task": "_create_human_task",
+    "human_review": "_create_human_task",
+    "create_sqs_queue": "_handle_sqs_creation",
+    "validate_prerequisites": "_handle_prerequisite_validation",
+    "execute_remediation": "_handle_remediation_execution",
+    "verify_completion": "_handle_completion_verification",
+    "send_notification": "_handle_notification",
+    "update_compliance_status": "_handle_compliance_update",
+}
+
+
+@lru_cache(maxsize=256)
+def _classify_action_type(action: str, decision_type: RemediationType) -> str:
+    """Map a remediation action to a step action type.
+
+    Pure function of its inputs; memoised because bulk workflow creation sees
+    the same action strings repeatedly.
+    """
+    kind = _first_kind(_ACTION_TYPE_PATTERN, _ACTION_TYPE_PRIORITY, action)
+    if kind == "approval":
+        return "human_approval"
+    if kind == "delete":
+        return "database_operation"
+    if kind == "email":
+        if decision_type == RemediationType.MANUAL_ONLY:
+            return "human_task"
+        return "email_notification"
+    if kind == "review":
+        return "human_task"
+    if kind == "stop":
+        return "api_call"
+    if decision_type != RemediationType.AUTOMATIC:
+        return "human_task"
+    return "api_call"
+
+
 class WorkflowAgent:
     """Create workflows, execute steps, and manage human-in-the-loop tasks."""
 
     def __init__(self) -> None:
         self._human_tasks: Dict[str, Dict[str, Any]] = {}
-        self._workflow_templates = self._build_workflow_templates()
+        self._workflow_templates = _WORKFLOW_TEMPLATES
+
+    async def close(self) -> None:
+        """Close pooled SMTP connections and the SQLite database; called on application shutdown."""
+        _close_db_connection()
+        await asyncio.to_thread(_SMTP_POOL.close)
 
     # ------------------------------------------------------------------
     # Workflow creation
@@ -123,10 +423,9 @@ class WorkflowAgent:
             action_type=entry["action_type"],
             parameters=entry.get("parameters", {}),
             estimated_duration_minutes=duration,
+            step_type=entry.get("step_type", "automated"),
+            requires_human_approval=entry.get("requires_human_approval", False),
         )
-        step.expected_duration = duration
-        step.step_type = entry.get("step_type", "automated")
-        step.requires_human_approval = entry.get("requires_human_approval", False)
         return step
 
     def _map_remediation_action_to_step(
@@ -160,10 +459,9 @@ class WorkflowAgent:
             action_type=action_type,
             parameters=parameters,
             estimated_duration_minutes=duration,
+            step_type=self._classify_step_type(action_type, requires_approval),
+            requires_human_approval=requires_approval,
         )
-        step.expected_duration = duration
-        step.requires_human_approval = requires_approval
-        step.step_type = self._classify_step_type(action_type, requires_approval)
         return step
 
     # ------------------------------------------------------------------
@@ -262,24 +560,10 @@ class WorkflowAgent:
         }
 
     async def _execute_step(self, step: WorkflowStep) -> Dict[str, Any]:
-        handler_map = {
-            "api_call": self._run_api_call,
-            "database_operation": self._execute_database_step,
-            "email_notification": self._send_email_step,
-            "human_approval": self._create_approval_task,
-            "human_task": self._create_human_task,
-            "human_review": self._create_human_task,
-            "create_sqs_queue": self._handle_sqs_creation,
-            "validate_prerequisites": self._handle_prerequisite_validation,
-            "execute_remediation": self._handle_remediation_execution,
-            "verify_completion": self._handle_completion_verification,
-            "send_notification": self._handle_notification,
-            "update_compliance_status": self._handle_compliance_update,
-        }
-
-        handler = handler_map.get(step.action_type)
-        if handler is None:
+        handler_name = _STEP_HANDLERS.get(step.action_type)
+        if handler_name is None:
             return {"success": False, "error": f"Unsupported action type: {step.action_type}"}
+        handler = getattr(self, handler_name)
 
         try:
             result = await handler(step)
@@ -405,55 +689,26 @@ class WorkflowAgent:
     # Helper utilities
     # ------------------------------------------------------------------
     def _map_remediation_to_workflow_type(self, remediation_type: RemediationType) -> WorkflowType:
-        mapping = {
-            RemediationType.AUTOMATIC: WorkflowType.AUTOMATIC,
-            RemediationType.HUMAN_IN_LOOP: WorkflowType.HUMAN_IN_LOOP,
-            RemediationType.MANUAL_ONLY: WorkflowType.MANUAL_ONLY,
-        }
-        return mapping.get(remediation_type, WorkflowType.MANUAL_ONLY)
+        return _WORKFLOW_TYPES.get(remediation_type, WorkflowType.MANUAL_ONLY)
 
     def _determine_action_type(self, action: str, decision_type: RemediationType) -> str:
-        text = action.lower()
-        if any(keyword in text for keyword in ("approve", "approval", "authorize")):
-            return "human_approval"
-        if any(keyword in text for keyword in ("delete", "remove", "purge", "erase")):
-            return "database_operation"
-        if any(keyword in text for keyword in ("email", "notify", "message", "inform")):
-            if decision_type == RemediationType.MANUAL_ONLY:
-                return "human_task"
-            return "email_notification"
-        if any(keyword in text for keyword in ("review", "policy", "legal", "audit", "consent")):
-            return "human_task"
-        if "stop" in text or "halt" in text:
-            return "api_call"
-        if decision_type != RemediationType.AUTOMATIC:
-            return "human_task"
-        return "api_call"
+        return _classify_action_type(action, decision_type)
 
     def _requires_human_approval(self, action: str, decision_type: RemediationType) -> bool:
-        text = action.lower()
-        if decision_type in {RemediationType.HUMAN_IN_LOOP, RemediationType.MANUAL_ONLY}:
+        if decision_type in _APPROVAL_REMEDIATION_TYPES:
             return True
-        return any(keyword in text for keyword in ("delete", "legal", "approval", "policy", "sensitive"))
+        text = action.lower()
+        return any(keyword in text for keyword in _SENSITIVE_ACTION_KEYWORDS)
 
     def _estimate_step_duration(self, action: str, action_type: str) -> int:
-        base = {
-            "api_call": 5,
-            "database_operation": 15,
-            "email_notification": 8,
-            "human_task": 120,
-            "human_review": 90,
-            "human_approval": 30,
-        }.get(action_type, 12)
-
-        length = len(action)
-        if action_type == "human_task" and length > 80:
-            base = max(base, 120) + 30
-        elif action_type == "api_call" and length > 60:
-            base += 3
-        elif action_type == "database_operation" and "backup" in action.lower():
-            base += 10
-
+        base = _STEP_DURATIONS.get(action_type, _DEFAULT_STEP_DURATION)
+
+        if action_type == "human_task" and len(action) > 80:
+            return base + 30
+        if action_type == "api_call" and len(action) > 60:
+            return base + 3
+        if action_type == "database_operation" and _matched_kinds(_BACKUP_PATTERN, action):
+            return base + 10
         return base
 
     def _classify_step_type(self, action_type: str, requires_approval: bool) -> str:
@@ -463,11 +718,8 @@ class WorkflowAgent:
             return "automated_with_approval"
         return "automated"
 
-    def _add_approval_step_if_needed(
-        self, steps: List[WorkflowStep], decision_type: RemediationType, violation_id: str
-    ) -> List[WorkflowStep]:
-        needs_approval = decision_type in {RemediationType.HUMAN_IN_LOOP, RemediationType.MANUAL_ONLY}
-        if needs_approval and not any(step.action_type == "human_approval" for step in steps):
+    def _inject_approval_step(self, steps: List[WorkflowStep], violation_id: str) -> List[WorkflowStep]:
+        if not any(step.action_type == "human_approval" for step in steps):
             approval_parameters = self._create_approval_parameters("Approve remediation", violation_id)
             approval_step = WorkflowStep(
                 id=f"approval_{uuid.uuid4().hex[:6]}",
@@ -476,32 +728,31 @@ class WorkflowAgent:
                 action_type="human_approval",
                 parameters=approval_parameters,
                 estimated_duration_minutes=30,
+                step_type="manual",
+                requires_human_approval=True,
             )
-            approval_step.expected_duration = 30
-            approval_step.requires_human_approval = True
-            approval_step.step_type = "manual"
             return [approval_step] + steps
         return steps
 
+    def _add_approval_step_if_needed(
+        self, steps: List[WorkflowStep], decision_type: RemediationType, violation_id: str
+    ) -> List[WorkflowStep]:
+        injector_name = _APPROVAL_INJECTORS.get(decision_type)
+        if injector_name is None:
+            return steps
+        return getattr(self, injector_name)(steps, violation_id)
+
     def _calculate_total_duration(self, steps: List[WorkflowStep]) -> int:
-        total = 0
-        for step in steps:
-            duration = step.expected_duration or step.estimated_duration_minutes or 0
-            total += duration
-        return total
+        return sum(step.expected_duration or step.estimated_duration_minutes or 0 for step in steps)
 
     def _create_email_parameters(self, action: str, violation_id: Any) -> Dict[str, Any]:
-        text = action.lower()
-        template = "remediation_update"
-        if "confirm" in text or "deletion" in text:
-            template = "deletion_confirmation"
-        subject = f"Remediation update for violation {violation_id}"
-        if "delete" in text:
+        found = _matched_kinds(_EMAIL_PATTERN, action)
+        template = "deletion_confirmation" if "confirm" in found else "remediation_update"
+        if "delete" in found:
             subject = f"Deletion confirmation for {violation_id}"
-
-        recipient = "user@example.com"
-        if "notify" in text or "stakeholder" in text:
-            recipient = "stakeholders@example.com"
+        else:
+            subject = f"Remediation update for violation {violation_id}"
+        recipient = "stakeholders@example.com" if "notify" in found else "user@example.com"
 
         return {
             "recipient": recipient,
@@ -511,23 +762,8 @@ class WorkflowAgent:
         }
 
     def _create_human_task_parameters(self, action: str, violation_id: Any) -> Dict[str, Any]:
-        text = action.lower()
-        if "legal" in text:
-            task_type = "legal_review"
-            role = "legal_counsel"
-            priority = "high"
-        elif "policy" in text or "update" in text:
-            task_type = "policy_update"
-            role = "compliance_officer"
-            priority = "medium"
-        elif "consent" in text:
-            task_type = "consent_update"
-            role = "data_steward"
-            priority = "medium"
-        else:
-            task_type = "manual_task"
-            role = "operations_team"
-            priority = "medium"
+        kind = _first_kind(_HUMAN_TASK_PATTERN, _HUMAN_TASK_PRIORITY, action)
+        task_type, role, priority = _HUMAN_TASK_TEMPLATES[kind]
 
         return {
             "task_type": task_type,
@@ -538,15 +774,8 @@ class WorkflowAgent:
         }
 
     def _create_approval_parameters(self, action: str, violation_id: Any) -> Dict[str, Any]:
-        text = action.lower()
-        if "policy" in text:
-            approval_type = "policy_change"
-            approver = "compliance_officer"
-            requires_legal = True
-        else:
-            approval_type = "data_deletion"
-            approver = "data_protection_officer"
-            requires_legal = False
+        kind = "policy" if "policy" in _matched_kinds(_APPROVAL_PATTERN, action) else "default"
+        approval_type, approver, requires_legal = _APPROVAL_TEMPLATES[kind]
 
         return {
             "approval_type": approval_type,
@@ -558,17 +787,9 @@ class WorkflowAgent:
         }
 
     def _create_api_call_parameters(self, action: str, violation_id: Any) -> Dict[str, Any]:
-        text = action.lower()
-        endpoint_base = "https://api.example.com"
-        if "stop" in text or "halt" in text:
-            endpoint = f"{endpoint_base}/remediation/{violation_id}/stop"
-            method = "POST"
-        elif "update" in text or "modify" in text:
-            endpoint = f"{endpoint_base}/remediation/{violation_id}/update"
-            method = "PUT"
-        else:
-            endpoint = f"{endpoint_base}/remediation/{violation_id}/action"
-            method = "POST"
+        kind = _first_kind(_API_CALL_PATTERN, _API_CALL_PRIORITY, action)
+        route, method = _API_CALL_ROUTES[kind]
+        endpoint = f"https://api.example.com/remediation/{violation_id}/{route}"
 
         return {
             "endpoint": endpoint,
@@ -577,8 +798,7 @@ class WorkflowAgent:
         }
 
     def _create_database_parameters(self, action: str, violation_id: Any) -> Dict[str, Any]:
-        text = action.lower()
-        if "delete" in text or "remove" in text:
+        if _matched_kinds(_DATABASE_PATTERN, action):
             query = "DELETE FROM remediation_actions WHERE violation_id = ?"
             params = [violation_id]
             backup_required = True
@@ -598,61 +818,23 @@ class WorkflowAgent:
         message["To"] = params.get("recipient", "user@example.com")
         message["From"] = "remediation@example.com"
         message["Subject"] = params.get("subject", "Remediation update")
-        message.set_content(json.dumps(params.get("data", {})))
+        data = params.get("data", {})
+        template = _EMAIL_TEMPLATES.get(params.get("template"))
+        message.set_content(template.format_map(_TemplateData(data)) if template else json.dumps(data))
 
-        with smtplib.SMTP("localhost") as smtp:  # pragma: no cover - mocked in tests
-            smtp.send_message(message)
+        # smtplib blocks, so keep the send off the event loop
+        await asyncio.to_thread(_SMTP_POOL.send_message, message)
 
         return {"success": True, "message": "Email notification sent", "message_id": uuid.uuid4().hex}
 
     async def _execute_database_query(self, query: str, params: Optional[List[Any]] = None) -> Dict[str, Any]:
         params = params or []
-        with sqlite3.connect(":memory:") as connection:  # pragma: no cover - mocked in tests
-            cursor = connection.cursor()
-            cursor.execute(query, params)
-            connection.commit()
-            rows = cursor.rowcount
+        connection = _db_connection()
+        with connection:
+            rows = connection.execute(query, params).rowcount
 
         return {"success": True, "rows_affected": rows, "message": "Database operation completed"}
 
     async def _store_human_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         self._human_tasks[task["task_id"]] = task
         return task
-
-    def _build_workflow_templates(self) -> Dict[RemediationType, List[Dict[str, Any]]]:
-        return {
-            RemediationType.AUTOMATIC: [
-                {
-                    "name": "Data analysis",
-                    "description": "Assess impact and scope",
-                    "action_type": "api_call",
-                    "parameters": {"endpoint": "https://api.example.com/analyse", "method": "POST"},
-                    "duration": 10,
-                },
-                {
-                    "name": "Validate prerequisites",
-                    "description": "Ensure environment is ready",
-                    "action_type": "validate_prerequisites",
-                    "duration": 8,
-                },
-            ],
-            RemediationType.HUMAN_IN_LOOP: [
-                {
-                    "name": "Human review",
-                    "description": "Compliance team reviews remediation plan",
-                    "action_type": "human_review",
-                    "requires_human_approval": True,
-                    "step_type": "manual",
-                    "duration": 60,
-                },
-            ],
-            RemediationType.MANUAL_ONLY: [
-                {
-                    "name": "Initial coordination",
-                    "description": "Assign manual remediation tasks",
-                    "action_type": "human_task",
-                    "step_type": "manual",
-                    "duration": 45,
-                }
-            ],
-        }
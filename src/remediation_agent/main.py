@@ -507,6 +507,10 @@ class RemediationAgent:
         except Exception as e:
             logger.warning(f"Could not send completion notification: {str(e)}")
 
+    async def close(self):
+        """Release resources held by the workflow agent, such as pooled SMTP connections"""
+        await self.graph.workflow_node.workflow_agent.close()
+
     def print_graph_structure(self):
         """Print the ASCII representation of the LangGraph structure"""
         return self.graph.print_graph_ascii()
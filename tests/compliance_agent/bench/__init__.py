@@ -0,0 +1,3 @@
+"""
+Benchmarks for compliance agent helpers
+"""
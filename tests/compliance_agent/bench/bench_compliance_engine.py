@@ -0,0 +1,34 @@
+"""
+Benchmarks for the compliance engine's pure scoring helpers
+
+Not collected by default (files are named bench_*). Run explicitly with:
+
+    pytest tests/compliance_agent/bench/bench_compliance_engine.py --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.compliance_agent.core.compliance_engine import ComplianceEngine
+from src.compliance_agent.models.compliance_models import RiskLevel
+
+# Scores either side of every risk threshold
+_SCORES = (0, 24.9, 25, 49.9, 50, 74.9, 75, 100)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ComplianceEngine()
+
+
+@pytest.mark.benchmark(group="compliance-engine")
+def test_bench_risk_score_to_level(benchmark, engine):
+    """Benchmark mapping a batch of risk scores to levels"""
+
+    def classify():
+        return [engine._risk_score_to_level(score) for score in _SCORES]
+
+    levels = benchmark(classify)
+    assert levels[0] == RiskLevel.LOW
+    assert levels[-1] == RiskLevel.CRITICAL
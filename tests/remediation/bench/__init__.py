@@ -0,0 +1,3 @@
+"""
+Benchmarks for remediation agent test fixtures
+"""
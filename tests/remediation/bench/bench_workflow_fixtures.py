@@ -0,0 +1,54 @@
+"""
+Benchmarks for workflow agent fixture construction
+
+Not collected by default (files are named bench_*). Run explicitly with:
+
+    pytest tests/remediation/bench/bench_workflow_fixtures.py --benchmark-only
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.compliance_agent.models.compliance_models import (
+    ComplianceFramework,
+    ComplianceViolation,
+    DataType,
+    RiskLevel,
+)
+from src.remediation_agent.agents.workflow_agent import WorkflowAgent
+
+
+def _build_sample_violation() -> ComplianceViolation:
+    """Mirror of the ``sample_violation`` conftest fixture."""
+    return ComplianceViolation(
+        id="gdpr_art17_violation_001",
+        violation_type="unauthorized_data_processing",
+        description="User requested data deletion but system lacks automated deletion capability",
+        risk_level=RiskLevel.HIGH,
+        framework=ComplianceFramework.GDPR_EU,
+        data_subject_id="user-456",
+        affected_data_types=[DataType.PERSONAL_DATA],
+        remediation_actions=[
+            "Delete user personal data from database",
+            "Remove user from mailing lists",
+            "Verify complete data removal",
+            "Send confirmation to user",
+        ],
+        evidence={"log_entry": "Unauthorized access detected"},
+        detection_timestamp="2024-01-15T10:30:00Z",
+    )
+
+
+@pytest.mark.benchmark(group="workflow-fixtures")
+def test_bench_workflow_agent_construction(benchmark):
+    """Benchmark WorkflowAgent() as built by the workflow_agent fixture"""
+    agent = benchmark(WorkflowAgent)
+    assert agent._workflow_templates
+
+
+@pytest.mark.benchmark(group="workflow-fixtures")
+def test_bench_sample_violation_construction(benchmark):
+    """Benchmark building the sample violation used by workflow tests"""
+    violation = benchmark(_build_sample_violation)
+    assert violation.rule_id == "gdpr_art17_violation_001"
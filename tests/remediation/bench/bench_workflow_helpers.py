@@ -0,0 +1,83 @@
+"""
+Benchmarks for the pure workflow agent helpers
+
+Guards the lookup-table, keyword-scan and memoisation paths against
+regressions. Not collected by default (files are named bench_*). Save a
+baseline and compare against it with:
+
+    make bench-save
+    make bench-compare
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.remediation_agent.agents.workflow_agent import WorkflowAgent
+from src.remediation_agent.state.models import RemediationType, WorkflowStep
+
+_ACTIONS = (
+    "Delete user personal data from database",
+    "Notify stakeholders of remediation",
+    "Conduct legal review of retention policy",
+    "Approve data deletion",
+    "Stop processing user data",
+)
+
+_STEPS = [
+    WorkflowStep(id=f"step-{index}", name=f"Step {index}", action_type="api_call", expected_duration=index % 30)
+    for index in range(1000)
+]
+
+
+@pytest.fixture(scope="module")
+def workflow_agent():
+    return WorkflowAgent()
+
+
+@pytest.mark.benchmark(group="workflow-helpers")
+def test_bench_calculate_total_duration(benchmark, workflow_agent):
+    """Benchmark summing durations over a 1000-step workflow"""
+    total = benchmark(workflow_agent._calculate_total_duration, _STEPS)
+    assert total == sum(index % 30 for index in range(1000))
+
+
+@pytest.mark.benchmark(group="workflow-helpers")
+def test_bench_determine_action_type(benchmark, workflow_agent):
+    """Benchmark classifying a batch of remediation actions"""
+
+    def classify():
+        return [workflow_agent._determine_action_type(action, RemediationType.HUMAN_IN_LOOP) for action in _ACTIONS]
+
+    assert benchmark(classify)[0] == "database_operation"
+
+
+@pytest.mark.benchmark(group="workflow-helpers")
+def test_bench_estimate_step_duration(benchmark, workflow_agent):
+    """Benchmark estimating durations for a batch of actions"""
+
+    def estimate():
+        return [workflow_agent._estimate_step_duration(action, "database_operation") for action in _ACTIONS]
+
+    assert benchmark(estimate)[0] == 15
+
+
+@pytest.mark.benchmark(group="workflow-helpers")
+@pytest.mark.parametrize(
+    "method",
+    [
+        "_create_database_parameters",
+        "_create_email_parameters",
+        "_create_human_task_parameters",
+        "_create_approval_parameters",
+        "_create_api_call_parameters",
+    ],
+)
+def test_bench_create_parameters(benchmark, workflow_agent, method):
+    """Benchmark each step parameter builder over a batch of actions"""
+    build = getattr(workflow_agent, method)
+
+    def build_all():
+        return [build(action, "violation-123") for action in _ACTIONS]
+
+    assert len(benchmark(build_all)) == len(_ACTIONS)
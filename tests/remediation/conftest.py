@@ -2,7 +2,7 @@
 
 import pytest
 import asyncio
-from typing import Generator, Dict, Any, List
+from typing import Generator, Dict, Any, List, Optional
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
 from uuid import uuid4
@@ -30,6 +30,10 @@ from src.compliance_agent.models.compliance_models import (
 )
 
 
+# Fixed timestamp for fixtures whose tests never compare against the clock
+_FIXED_NOW = datetime(2024, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
+
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     """Create an instance of the default event loop for the test session."""
@@ -371,53 +375,33 @@ def mock_uuid():
             yield test_uuid
 
 @pytest.fixture
-def sample_automatic_decision(
-    sample_compliance_violation: ComplianceViolation,
-    sample_data_processing_activity: DataProcessingActivity,
-) -> RemediationDecision:
-    return RemediationDecision(
-        violation_id=sample_compliance_violation.rule_id,
-        activity_id=sample_data_processing_activity.id,
-        remediation_type=RemediationType.AUTOMATIC,
-        confidence_score=0.9,
-        reasoning="Simple data preference update with high confidence",
-        estimated_effort=15,
-        risk_if_delayed=RiskLevel.LOW,
-    )
-
-
-@pytest.fixture
-def sample_human_in_loop_decision(
+def make_decision(
     sample_compliance_violation: ComplianceViolation,
     sample_data_processing_activity: DataProcessingActivity,
-) -> RemediationDecision:
-    return RemediationDecision(
-        violation_id=sample_compliance_violation.rule_id,
-        activity_id=sample_data_processing_activity.id,
-        remediation_type=RemediationType.HUMAN_IN_LOOP,
-        confidence_score=0.75,
-        reasoning="Data deletion requires human oversight",
-        estimated_effort=60,
-        risk_if_delayed=RiskLevel.MEDIUM,
-        prerequisites=["dpo_approval"],
-    )
-
-
-@pytest.fixture
-def sample_manual_decision(
-    sample_compliance_violation: ComplianceViolation,
-    sample_data_processing_activity: DataProcessingActivity,
-) -> RemediationDecision:
-    return RemediationDecision(
-        violation_id=sample_compliance_violation.rule_id,
-        activity_id=sample_data_processing_activity.id,
-        remediation_type=RemediationType.MANUAL_ONLY,
-        confidence_score=0.6,
-        reasoning="Complex legal changes require manual implementation",
-        estimated_effort=480,
-        risk_if_delayed=RiskLevel.CRITICAL,
-        prerequisites=["legal_review", "executive_signoff"],
-    )
+):
+    """Factory for remediation decisions tied to the sample violation and activity."""
+
+    def _make(
+        remediation_type: RemediationType,
+        confidence_score: float,
+        reasoning: str,
+        estimated_effort: int,
+        risk_if_delayed: RiskLevel,
+        prerequisites: Optional[List[str]] = None,
+    ) -> RemediationDecision:
+        return RemediationDecision(
+            violation_id=sample_compliance_violation.rule_id,
+            activity_id=sample_data_processing_activity.id,
+            remediation_type=remediation_type,
+            confidence_score=confidence_score,
+            reasoning=reasoning,
+            estimated_effort=estimated_effort,
+            risk_if_delayed=risk_if_delayed,
+            prerequisites=prerequisites or [],
+            created_at=_FIXED_NOW,
+        )
+
+    return _make
 
 
 @pytest.fixture
@@ -0,0 +1,765 @@
+"""
+Unit tests for workflow agent
+"""
+
+import smtplib
+import threading
+from types import MappingProxyType, SimpleNamespace
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.remediation_agent.agents.workflow_agent import _SMTPPool, _matched_kinds
+from src.remediation_agent.state.models import (
+    RemediationType,
+    RiskLevel,
+    RemediationWorkflow,
+    WorkflowStatus,
+    WorkflowStep,
+    WorkflowType,
+)
+
+_WORKFLOW_MODULE = "src.remediation_agent.agents.workflow_agent"
+
+
+class _FakeResp:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, status, json_data=None, text_data=""):
+        self.status = status
+        self._json = json_data
+        self._text = text_data
+
+    async def json(self):
+        return self._json
+
+    async def text(self):
+        return self._text
+
+
+class _FakeReq:
+    """Async context manager returned by ``ClientSession.request``."""
+
+    def __init__(self, resp):
+        self.resp = resp
+
+    async def __aenter__(self):
+        return self.resp
+
+    async def __aexit__(self, *args):
+        return False
+
+
+@pytest.fixture(scope="module")
+def workflow_agent():
+    """Create a workflow agent shared by the tests in this module.
+
+    The agent only carries an in-memory human task registry, so reusing it is
+    safe and keeps each xdist worker to a single construction.
+    """
+    from src.remediation_agent.agents.workflow_agent import WorkflowAgent
+
+    return WorkflowAgent()
+
+
+# Read-only step parameters shared across tests; WorkflowStep copies them into
+# its own dict, so steps built from the same constant stay independent.
+_API_PARAMS = MappingProxyType({"endpoint": "/api/test", "method": "GET"})
+_DB_PARAMS = MappingProxyType({"query": "DELETE FROM users WHERE id = ?", "params": ["user-456"]})
+_EMAIL_PARAMS = MappingProxyType({"recipient": "user@example.com", "subject": "Update"})
+_APPROVAL_PARAMS = MappingProxyType({"approver_role": "data_protection_officer"})
+_HUMAN_TASK_PARAMS = MappingProxyType({"task_type": "legal_review"})
+
+# Steps shared by tests that only read them; never execute or mutate these.
+_DURATION_STEPS = (
+    WorkflowStep(id="1", name="Step 1", action_type="api_call", expected_duration=10),
+    WorkflowStep(id="2", name="Step 2", action_type="database_operation", expected_duration=15),
+    WorkflowStep(id="3", name="Step 3", action_type="email_notification", expected_duration=5),
+)
+
+_WORKFLOW_DEFAULTS = {
+    "id": "workflow-123",
+    "violation_id": "violation-123",
+    "activity_id": "activity-123",
+    "remediation_type": RemediationType.AUTOMATIC,
+    "workflow_type": WorkflowType.AUTOMATIC,
+}
+
+
+@pytest.fixture
+def make_workflow():
+    """Factory for automatic workflows that only vary by steps and status."""
+
+    def _make(steps, status=WorkflowStatus.PENDING):
+        return RemediationWorkflow(**_WORKFLOW_DEFAULTS, steps=steps, status=status)
+
+    return _make
+
+
+def _fake_smtp(send_message=None):
+    """Return a shared SMTP server stub and a pool ``connect`` callable opening it.
+
+    Plain namespaces keep these hot tests clear of MagicMock attribute bookkeeping.
+    """
+    server = SimpleNamespace(sent=[], opened=[], closed=0, quit_calls=0)
+    server.send_message = send_message or server.sent.append
+    server.noop = lambda: (250, b"OK")
+
+    def close():
+        server.closed += 1
+
+    def quit():
+        server.quit_calls += 1
+        close()
+
+    def connect(host):
+        server.opened.append(host)
+        return server
+
+    server.close = close
+    server.quit = quit
+    return server, connect
+
+
+def _fake_cursor(rowcount=1):
+    return SimpleNamespace(rowcount=rowcount, fetchall=lambda: [])
+
+
+class _FakeConnection:
+    """sqlite3 connection stand-in whose ``execute`` returns a fixed cursor."""
+
+    def __init__(self, rowcount=1):
+        self.executed = []
+        self._cursor = _fake_cursor(rowcount)
+
+    def execute(self, query, params=()):
+        self.executed.append((query, params))
+        return self._cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def _scripted_steps(outcomes):
+    """Return an async ``_execute_step`` replacement yielding ``outcomes`` in order.
+
+    Used instead of a ``side_effect`` mock where call recording is not asserted.
+    """
+    remaining = iter(outcomes)
+
+    async def _execute_step(step):
+        return next(remaining)
+
+    return _execute_step
+
+
+class TestWorkflowAgent:
+    """Test WorkflowAgent class"""
+
+    @pytest.fixture
+    def api_call_step(self):
+        """Create an API call step for testing"""
+        return WorkflowStep(
+            id="step-api",
+            name="Call remediation API",
+            action_type="api_call",
+            parameters=_API_PARAMS,
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_workflow_automatic_simple(self, workflow_agent, make_decision, sample_violation):
+        """Test creating an automatic workflow"""
+        decision = make_decision(
+            RemediationType.AUTOMATIC,
+            0.9,
+            "Simple data preference update with high confidence",
+            15,
+            RiskLevel.LOW,
+        )
+        workflow = await workflow_agent.create_workflow(decision, sample_violation)
+
+        assert workflow.violation_id == sample_violation.rule_id
+        assert workflow.remediation_type == RemediationType.AUTOMATIC
+        assert workflow.workflow_type == WorkflowType.AUTOMATIC
+        assert [step.action_type for step in workflow.steps] == [
+            "database_operation",
+            "database_operation",
+            "api_call",
+            "api_call",
+            "api_call",
+            "validate_prerequisites",
+        ]
+        assert workflow.total_estimated_duration == sum(step.expected_duration for step in workflow.steps)
+
+    @pytest.mark.asyncio
+    async def test_create_workflow_human_in_loop(self, workflow_agent, make_decision, sample_violation):
+        """Test that human-in-loop workflows start with an approval step"""
+        decision = make_decision(
+            RemediationType.HUMAN_IN_LOOP,
+            0.75,
+            "Data deletion requires human oversight",
+            60,
+            RiskLevel.MEDIUM,
+            prerequisites=["dpo_approval"],
+        )
+        workflow = await workflow_agent.create_workflow(decision, sample_violation)
+
+        assert workflow.workflow_type == WorkflowType.HUMAN_IN_LOOP
+        assert workflow.steps[0].action_type == "human_approval"
+        assert "approval" in workflow.steps[0].name.lower()
+        assert workflow.steps[-1].action_type == "human_review"
+        assert [step.order for step in workflow.steps] == list(range(len(workflow.steps)))
+
+    @pytest.mark.asyncio
+    async def test_create_workflow_manual(self, workflow_agent, make_decision, sample_violation):
+        """Test creating a manual-only workflow"""
+        decision = make_decision(
+            RemediationType.MANUAL_ONLY,
+            0.6,
+            "Complex legal changes require manual implementation",
+            480,
+            RiskLevel.CRITICAL,
+            prerequisites=["legal_review", "executive_signoff"],
+        )
+        workflow = await workflow_agent.create_workflow(decision, sample_violation)
+
+        assert workflow.workflow_type == WorkflowType.MANUAL_ONLY
+        assert workflow.steps[0].action_type == "human_approval"
+        assert workflow.metadata["decision_confidence"] == decision.confidence_score
+
+    def test_add_approval_step_for_human_in_loop(self, workflow_agent, api_call_step):
+        """Test that human-in-loop steps gain a leading approval step"""
+        steps = workflow_agent._add_approval_step_if_needed(
+            [api_call_step], RemediationType.HUMAN_IN_LOOP, "violation-123"
+        )
+
+        assert [step.action_type for step in steps] == ["human_approval", "api_call"]
+        assert steps[0].requires_human_approval is True
+        assert steps[0].parameters["violation_id"] == "violation-123"
+
+    def test_no_approval_step_for_automatic(self, workflow_agent, api_call_step):
+        """Test that automatic steps are returned as-is"""
+        steps = [api_call_step]
+
+        assert workflow_agent._add_approval_step_if_needed(steps, RemediationType.AUTOMATIC, "violation-123") is steps
+
+    @pytest.mark.parametrize(
+        "action,decision_type,expected",
+        [
+            ("Approve data deletion request", RemediationType.AUTOMATIC, "human_approval"),
+            ("Delete user personal data from database", RemediationType.AUTOMATIC, "database_operation"),
+            ("Notify user of changes", RemediationType.AUTOMATIC, "email_notification"),
+            ("Notify user of changes", RemediationType.MANUAL_ONLY, "human_task"),
+            ("Conduct legal review", RemediationType.AUTOMATIC, "human_task"),
+            ("Stop processing user data", RemediationType.HUMAN_IN_LOOP, "api_call"),
+            ("Verify complete data removal", RemediationType.HUMAN_IN_LOOP, "human_task"),
+            ("Verify complete data removal", RemediationType.AUTOMATIC, "api_call"),
+            # Overlapping keywords still count: "erase" inside "messagerase" outranks "message"
+            ("Run messagerase job", RemediationType.AUTOMATIC, "database_operation"),
+        ],
+    )
+    def test_determine_action_type(self, workflow_agent, action, decision_type, expected):
+        """Test classification of remediation actions into step action types"""
+        assert workflow_agent._determine_action_type(action, decision_type) == expected
+
+    def test_determine_action_type_is_memoised(self, workflow_agent):
+        """Test repeated classifications are served from the cache"""
+        from src.remediation_agent.agents.workflow_agent import _classify_action_type
+
+        action = "Purge stale marketing records"
+        first = workflow_agent._determine_action_type(action, RemediationType.AUTOMATIC)
+        hits_before = _classify_action_type.cache_info().hits
+        second = workflow_agent._determine_action_type(action, RemediationType.AUTOMATIC)
+
+        assert first == second == "database_operation"
+        assert _classify_action_type.cache_info().hits == hits_before + 1
+
+    def test_map_remediation_action_to_step_database(self, workflow_agent):
+        """Test mapping a deletion action to a database step"""
+        step = workflow_agent._map_remediation_action_to_step(
+            "Delete user personal data from database", 0, RemediationType.AUTOMATIC, "violation-123"
+        )
+
+        assert step.action_type == "database_operation"
+        assert step.parameters["params"] == ["violation-123"]
+        assert step.requires_human_approval is True
+        assert step.step_type == "automated_with_approval"
+
+    def test_map_remediation_action_to_step_human_task(self, workflow_agent):
+        """Test mapping a review action to a manual step"""
+        step = workflow_agent._map_remediation_action_to_step(
+            "Conduct legal review", 1, RemediationType.HUMAN_IN_LOOP, "violation-123"
+        )
+
+        assert step.action_type == "human_task"
+        assert step.parameters["task_type"] == "legal_review"
+        assert step.step_type == "manual"
+        assert step.id.startswith("action_1_")
+
+    @pytest.mark.asyncio
+    async def test_execute_step_api_call_success(self, workflow_agent, api_call_step):
+        """Test successful API call step execution"""
+        fake_request = _FakeReq(_FakeResp(200, {"success": True}))
+
+        with patch("aiohttp.ClientSession.request", return_value=fake_request):
+            result = await workflow_agent._execute_step(api_call_step)
+
+        assert result["success"] is True
+        assert result["response"] == {"success": True}
+        assert result["message"] == "API call completed"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_api_call_failure(self, workflow_agent, api_call_step):
+        """Test API call step execution with an error status"""
+        fake_request = _FakeReq(_FakeResp(500, text_data="Internal Server Error"))
+
+        with patch("aiohttp.ClientSession.request", return_value=fake_request):
+            result = await workflow_agent._execute_step(api_call_step)
+
+        assert result["success"] is False
+        assert "500" in result["error"]
+        assert "Internal Server Error" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_step_database_operation(self, workflow_agent):
+        """Test database operation step execution"""
+        step = WorkflowStep(
+            id="step-db",
+            name="Delete user data",
+            action_type="database_operation",
+            parameters=_DB_PARAMS,
+        )
+        query_result = {"success": True, "rows_affected": 1}
+
+        with patch.object(
+            workflow_agent, "_execute_database_query", new=AsyncMock(return_value=query_result)
+        ) as mock_query:
+            result = await workflow_agent._execute_step(step)
+
+        mock_query.assert_awaited_once_with("DELETE FROM users WHERE id = ?", ["user-456"])
+        assert result["success"] is True
+        assert result["message"] == "Database operation completed"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_email_notification(self, workflow_agent):
+        """Test email notification step execution"""
+        step = WorkflowStep(
+            id="step-email",
+            name="Notify user",
+            action_type="email_notification",
+            parameters=_EMAIL_PARAMS,
+        )
+
+        with patch.object(
+            workflow_agent, "_send_email", new=AsyncMock(return_value={"success": True})
+        ):
+            result = await workflow_agent._execute_step(step)
+
+        assert result["success"] is True
+        assert result["message"] == "Email notification sent"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_email_notification_failure(self, workflow_agent):
+        """Test email notification step reporting a delivery failure"""
+        step = WorkflowStep(id="step-email", name="Notify user", action_type="email_notification")
+
+        with patch.object(
+            workflow_agent, "_send_email", new=AsyncMock(return_value={"success": False})
+        ):
+            result = await workflow_agent._execute_step(step)
+
+        assert result["success"] is False
+        assert result["error"] == "Email notification failed"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_human_approval(self, workflow_agent):
+        """Test approval step creates a pending human task"""
+        step = WorkflowStep(
+            id="step-approval",
+            name="Approve deletion",
+            action_type="human_approval",
+            parameters=_APPROVAL_PARAMS,
+        )
+
+        result = await workflow_agent._execute_step(step)
+
+        assert result["success"] is True
+        assert result["status"] == "pending"
+        assert workflow_agent._human_tasks[result["task_id"]]["approver_role"] == "data_protection_officer"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_human_task(self, workflow_agent):
+        """Test human task step creates an assigned task"""
+        step = WorkflowStep(
+            id="step-human",
+            name="Legal review",
+            action_type="human_task",
+            parameters=_HUMAN_TASK_PARAMS,
+        )
+
+        result = await workflow_agent._execute_step(step)
+
+        assert result["success"] is True
+        assert result["status"] == "assigned"
+        assert workflow_agent._human_tasks[result["task_id"]]["type"] == "legal_review"
+
+    def test_step_parameters_are_copied_from_shared_constants(self, api_call_step):
+        """Test that steps never alias the frozen module-level parameters"""
+        api_call_step.parameters["method"] = "POST"
+
+        assert isinstance(api_call_step.parameters, dict)
+        assert _API_PARAMS["method"] == "GET"
+
+    @pytest.mark.asyncio
+    async def test_execute_step_unsupported_action(self, workflow_agent):
+        """Test that unknown action types are rejected"""
+        step = WorkflowStep(id="step-unknown", name="Unknown", action_type="teleport")
+
+        result = await workflow_agent._execute_step(step)
+
+        assert result["success"] is False
+        assert "Unsupported action type" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow_empty_steps(self, workflow_agent, make_workflow):
+        """Test executing a workflow without steps"""
+        workflow = make_workflow([])
+
+        result = await workflow_agent.execute_workflow(workflow)
+
+        assert result["success"] is True
+        assert result["step_results"] == []
+        assert workflow.status == WorkflowStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow_success(self, workflow_agent, make_workflow, api_call_step):
+        """Test executing a workflow where every step succeeds"""
+        workflow = make_workflow([api_call_step])
+        fake_execute = _scripted_steps([{"success": True, "message": "done"}])
+
+        with patch.object(workflow_agent, "_execute_step", new=fake_execute):
+            result = await workflow_agent.execute_workflow(workflow)
+
+        assert result["success"] is True
+        assert result["execution_status"] == "completed"
+        assert workflow.status == WorkflowStatus.COMPLETED
+        assert api_call_step.status == WorkflowStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow_partial_failure(self, workflow_agent, make_workflow):
+        """Test that execution stops at the first failing step"""
+        steps = [
+            WorkflowStep(id="step-1", name="First", action_type="api_call"),
+            WorkflowStep(id="step-2", name="Second", action_type="api_call"),
+            WorkflowStep(id="step-3", name="Third", action_type="api_call"),
+        ]
+        workflow = make_workflow(steps)
+        fake_execute = _scripted_steps(
+            [{"success": True}, {"success": False, "error": "Step failed"}]
+        )
+
+        with patch.object(workflow_agent, "_execute_step", new=fake_execute):
+            result = await workflow_agent.execute_workflow(workflow)
+
+        assert result["success"] is False
+        assert result["error"] == "Step failed"
+        assert len(result["step_results"]) == 2
+        assert workflow.status == WorkflowStatus.FAILED
+        assert steps[1].status == WorkflowStatus.FAILED
+        assert steps[2].status == WorkflowStatus.PENDING
+
+
+class TestWorkflowAgentEdgeCases:
+    """Test WorkflowAgent helper methods and edge cases"""
+
+    def test_calculate_total_duration(self, workflow_agent):
+        """Test summing step durations"""
+        assert workflow_agent._calculate_total_duration(_DURATION_STEPS) == 30
+
+    def test_calculate_total_duration_empty_steps(self, workflow_agent):
+        """Test total duration of an empty workflow"""
+        assert workflow_agent._calculate_total_duration([]) == 0
+
+    def test_calculate_total_duration_none_durations(self, workflow_agent):
+        """Test falling back to estimated minutes when expected_duration is unset"""
+        steps = [
+            WorkflowStep(id="1", name="Step 1", action_type="api_call", estimated_duration_minutes=7),
+            WorkflowStep(id="2", name="Step 2", action_type="api_call", estimated_duration_minutes=0),
+        ]
+        for step in steps:
+            step.expected_duration = None
+
+        assert workflow_agent._calculate_total_duration(steps) == 7
+
+    def test_estimate_step_duration_empty_action(self, workflow_agent):
+        """Test that empty actions still get a positive default duration"""
+        assert workflow_agent._estimate_step_duration("", "api_call") == 5
+        assert workflow_agent._estimate_step_duration("", "unknown_type") > 0
+
+    def test_estimate_step_duration_adjustments(self, workflow_agent):
+        """Test length and keyword based duration adjustments"""
+        long_task = "Review " + "x" * 80
+
+        assert workflow_agent._estimate_step_duration(long_task, "human_task") == 150
+        assert workflow_agent._estimate_step_duration("Delete with backup", "database_operation") == 25
+
+    @pytest.mark.parametrize(
+        "method,action,expected",
+        [
+            pytest.param(
+                "_create_database_parameters",
+                "Delete user personal data",
+                {
+                    "query": "DELETE FROM remediation_actions WHERE violation_id = ?",
+                    "params": ["violation-123"],
+                    "backup_required": True,
+                },
+                id="database-delete",
+            ),
+            pytest.param(
+                "_create_database_parameters",
+                "Update consent records",
+                {
+                    "query": "UPDATE remediation_actions SET status = ? WHERE violation_id = ?",
+                    "params": ["updated", "violation-123"],
+                    "backup_required": False,
+                },
+                id="database-update",
+            ),
+            pytest.param(
+                "_create_email_parameters",
+                "Notify stakeholders of remediation",
+                {
+                    "recipient": "stakeholders@example.com",
+                    "template": "remediation_update",
+                    "subject": "Remediation update for violation violation-123",
+                },
+                id="email-notification",
+            ),
+            pytest.param(
+                "_create_email_parameters",
+                "Send deletion confirmation to user",
+                {"recipient": "user@example.com", "template": "deletion_confirmation"},
+                id="email-deletion-confirmation",
+            ),
+            pytest.param(
+                "_create_human_task_parameters",
+                "Conduct legal review",
+                {"task_type": "legal_review", "assigned_role": "legal_counsel", "priority": "high"},
+                id="human-task-legal-review",
+            ),
+            pytest.param(
+                "_create_human_task_parameters",
+                "Update privacy policy",
+                {"task_type": "policy_update", "assigned_role": "compliance_officer", "priority": "medium"},
+                id="human-task-policy-update",
+            ),
+            pytest.param(
+                "_create_approval_parameters",
+                "Approve data deletion",
+                {
+                    "approval_type": "data_deletion",
+                    "approver_role": "data_protection_officer",
+                    "requires_legal_review": False,
+                },
+                id="approval-data-deletion",
+            ),
+            pytest.param(
+                "_create_approval_parameters",
+                "Approve policy change",
+                {
+                    "approval_type": "policy_change",
+                    "approver_role": "compliance_officer",
+                    "requires_legal_review": True,
+                },
+                id="approval-policy-change",
+            ),
+        ],
+    )
+    def test_create_parameters(self, workflow_agent, method, action, expected):
+        """Test step parameter builders for each keyword branch"""
+        params = getattr(workflow_agent, method)(action, "violation-123")
+
+        assert {key: params[key] for key in expected} == expected
+
+    def test_create_email_parameters_data(self, workflow_agent):
+        """Test that email data carries the violation and action text"""
+        params = workflow_agent._create_email_parameters("Notify stakeholders of remediation", "violation-123")
+
+        assert params["data"] == {"violation_id": "violation-123", "message": "Notify stakeholders of remediation"}
+
+    def test_create_parameters_reuses_keyword_scan(self, workflow_agent):
+        """Test that repeated builds hit the keyword cache but return independent dicts"""
+        first = workflow_agent._create_database_parameters("Delete stale records", "violation-123")
+        hits = _matched_kinds.cache_info().hits
+        second = workflow_agent._create_database_parameters("Delete stale records", "violation-123")
+
+        assert _matched_kinds.cache_info().hits == hits + 1
+        assert second == first
+        first["params"].append("mutated")
+        assert second["params"] == ["violation-123"]
+
+    @pytest.mark.asyncio
+    async def test_send_email_success(self, workflow_agent):
+        """Test sending an email through SMTP"""
+        server, connect = _fake_smtp()
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", _SMTPPool(connect=connect)):
+            result = await workflow_agent._send_email(
+                {"recipient": "user@example.com", "subject": "Update", "data": {"violation_id": "v-1"}}
+            )
+
+        assert result["success"] is True
+        assert len(server.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_send_email_renders_template(self, workflow_agent):
+        """Test that known templates render the message body from the email data"""
+        params = workflow_agent._create_email_parameters("Send deletion confirmation to user", "violation-123")
+        server, connect = _fake_smtp()
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", _SMTPPool(connect=connect)):
+            await workflow_agent._send_email(params)
+
+        body = server.sent[0].get_content()
+        assert "violation-123 has been scheduled for deletion" in body
+        assert "Send deletion confirmation to user" in body
+
+    @pytest.mark.asyncio
+    async def test_send_email_reuses_pooled_connection(self, workflow_agent):
+        """Test that consecutive emails share one SMTP connection"""
+        server, connect = _fake_smtp()
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", _SMTPPool(connect=connect)):
+            for _ in range(3):
+                await workflow_agent._send_email({"recipient": "user@example.com"})
+
+        assert server.opened == ["localhost"]
+        assert len(server.sent) == 3
+
+    @pytest.mark.asyncio
+    async def test_send_email_discards_failed_connection(self, workflow_agent):
+        """Test that a connection failing mid-send is not returned to the pool"""
+
+        def disconnect(message):
+            raise smtplib.SMTPServerDisconnected()
+
+        server, connect = _fake_smtp(send_message=disconnect)
+        pool = _SMTPPool(connect=connect)
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", pool):
+            with pytest.raises(smtplib.SMTPServerDisconnected):
+                await workflow_agent._send_email({"recipient": "user@example.com"})
+
+        assert server.quit_calls == 1
+        assert server.closed == 1
+        assert pool._idle.empty()
+
+    @pytest.mark.asyncio
+    async def test_send_email_reconnects_when_idle_connection_dropped(self, workflow_agent):
+        """Test that a pooled connection failing its NOOP probe is replaced before sending"""
+        server, connect = _fake_smtp()
+        pool = _SMTPPool(connect=connect)
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", pool):
+            await workflow_agent._send_email({"recipient": "user@example.com"})
+
+            def dropped():
+                server.noop = lambda: (250, b"OK")
+                raise smtplib.SMTPServerDisconnected()
+
+            server.noop = dropped
+            await workflow_agent._send_email({"recipient": "user@example.com"})
+
+        assert server.opened == ["localhost", "localhost"]
+        assert len(server.sent) == 2
+        assert server.quit_calls == 1
+        assert pool._idle.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_send_email_is_not_retried_once_sending_started(self, workflow_agent):
+        """Test that a disconnect during the send is raised rather than resent"""
+        calls = []
+
+        def drop_second_send(message):
+            calls.append(message)
+            if len(calls) == 2:
+                raise smtplib.SMTPServerDisconnected()
+            server.sent.append(message)
+
+        server, connect = _fake_smtp(send_message=drop_second_send)
+        pool = _SMTPPool(connect=connect)
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", pool):
+            await workflow_agent._send_email({"recipient": "user@example.com"})
+            with pytest.raises(smtplib.SMTPServerDisconnected):
+                await workflow_agent._send_email({"recipient": "user@example.com"})
+
+        assert len(calls) == 2
+        assert server.opened == ["localhost"]
+        assert pool._idle.empty()
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_pooled_connections(self, workflow_agent):
+        """Test that closing the agent quits idle SMTP connections"""
+        server, connect = _fake_smtp()
+        pool = _SMTPPool(connect=connect)
+        with patch(f"{_WORKFLOW_MODULE}._SMTP_POOL", pool):
+            await workflow_agent._send_email({"recipient": "user@example.com"})
+            await workflow_agent.close()
+
+        assert server.quit_calls == 1
+        assert pool._idle.empty()
+
+    def test_discard_closes_connection_when_quit_fails(self):
+        """Test that discarding an already-dead connection still closes its socket"""
+        server, _ = _fake_smtp()
+
+        def quit():
+            raise smtplib.SMTPServerDisconnected()
+
+        server.quit = quit
+        _SMTPPool().discard(server)
+
+        assert server.closed == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_database_query_success(self, workflow_agent):
+        """Test executing a database query"""
+        connection = _FakeConnection(rowcount=1)
+        with patch(f"{_WORKFLOW_MODULE}._open_db", new=lambda: connection), patch(
+            f"{_WORKFLOW_MODULE}._DB_LOCAL", threading.local()
+        ):
+            result = await workflow_agent._execute_database_query(
+                "UPDATE remediation_actions SET status = ? WHERE violation_id = ?",
+                ["updated", "violation-123"],
+            )
+
+        assert result["success"] is True
+        assert result["rows_affected"] == 1
+        assert len(connection.executed) == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_database_query_reuses_connection(self, workflow_agent):
+        """Test that queries on the same thread share one SQLite connection"""
+        with patch(f"{_WORKFLOW_MODULE}._DB_LOCAL", threading.local()):
+            try:
+                await workflow_agent._execute_database_query("CREATE TABLE remediation_actions (violation_id TEXT)")
+                await workflow_agent._execute_database_query(
+                    "INSERT INTO remediation_actions VALUES (?)", ["violation-123"]
+                )
+                result = await workflow_agent._execute_database_query(
+                    "DELETE FROM remediation_actions WHERE violation_id = ?", ["violation-123"]
+                )
+            finally:
+                await workflow_agent.close()
+
+        assert result["rows_affected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_resets_database(self, workflow_agent):
+        """Test that closing the agent discards the thread's in-memory database"""
+        with patch(f"{_WORKFLOW_MODULE}._DB_LOCAL", threading.local()):
+            try:
+                await workflow_agent._execute_database_query("CREATE TABLE remediation_actions (violation_id TEXT)")
+                await workflow_agent.close()
+                await workflow_agent._execute_database_query("CREATE TABLE remediation_actions (violation_id TEXT)")
+            finally:
+                await workflow_agent.close()
@@ -1,80 +1,120 @@
 #!/usr/bin/env python3
 """
-Test script to demonstrate environment-specific configuration loading
+Tests for environment-specific configuration loading
 """
 
 import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 
 # Add src to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-def test_environment_loading():
-    """Test different environment configurations"""
-    
-    print("🧪 Testing Environment-Specific Configuration Loading")
-    print("=" * 60)
-    
-    # Test 1: Default environment
-    print("\n1️⃣  Testing DEFAULT environment:")
-    os.environ.pop("APP_ENV", None)  # Remove if exists
-    from config.settings import create_settings
-    settings = create_settings()
-    print(f"   APP_ENV: {settings.app_env}")
-    print(f"   Environment: {settings.environment}")
-    print(f"   Debug: {settings.debug}")
-    
-    # Test 2: Development environment
-    print("\n2️⃣  Testing DEVELOPMENT environment:")
-    os.environ["APP_ENV"] = "development"
-    settings = create_settings()
-    print(f"   APP_ENV: {settings.app_env}")
-    print(f"   Environment: {settings.environment}")
-    print(f"   Debug: {settings.debug}")
-    
-    # Test 3: SIT environment
-    print("\n3️⃣  Testing SIT environment:")
-    os.environ["APP_ENV"] = "sit"
-    settings = create_settings()
-    print(f"   APP_ENV: {settings.app_env}")
-    print(f"   Environment: {settings.environment}")
-    print(f"   Debug: {settings.debug}")
-    
-    # Test 4: Production environment
-    print("\n4️⃣  Testing PRODUCTION environment:")
-    os.environ["APP_ENV"] = "production"
+from config.settings import _build_settings, _read_env_file, create_settings
+
+
+@pytest.fixture
+def isolated_environ(monkeypatch):
+    """Run from the repository root with an empty environment restored afterwards"""
+    monkeypatch.chdir(project_root.parent)
+    with patch.dict(os.environ, clear=True):
+        yield os.environ
+
+
+@pytest.mark.parametrize(
+    "app_env,expected_app_env,expected_environment,expected_debug",
+    [
+        (None, "development", "development", True),
+        ("development", "development", "development", True),
+        ("sit", "sit", "sit", True),
+        ("prd", "prd", "production", False),
+        ("production", "production", "development", False),
+    ],
+)
+def test_environment_loading(isolated_environ, app_env, expected_app_env, expected_environment, expected_debug):
+    """Each APP_ENV loads its matching .env file, falling back to defaults"""
+    if app_env is not None:
+        isolated_environ["APP_ENV"] = app_env
+
     settings = create_settings()
-    print(f"   APP_ENV: {settings.app_env}")
-    print(f"   Environment: {settings.environment}")
-    print(f"   Debug: {settings.debug}")
-    
-    # Test 5: Command-line override
-    print("\n5️⃣  Testing COMMAND-LINE overrides:")
-    os.environ["APP_ENV"] = "production"
-    os.environ["AWS_REGION"] = "eu-west-1"
-    os.environ["AI_AGENT_API_KEY"] = "test_key_123"
+
+    assert settings.app_env == expected_app_env
+    assert settings.environment == expected_environment
+    assert settings.debug is expected_debug
+
+
+def test_environment_overrides(isolated_environ):
+    """Exported variables take precedence over values from .env files"""
+    isolated_environ.update(
+        {"APP_ENV": "prd", "AWS_REGION": "eu-west-1", "AI_AGENT_API_KEY": "test_key_123"}
+    )
+
     settings = create_settings()
-    print(f"   APP_ENV: {settings.app_env}")
-    print(f"   AWS_REGION: {settings.aws_region}")
-    print(f"   AI_AGENT_API_KEY: {'***' + settings.ai_agent_api_key[-4:] if settings.ai_agent_api_key else 'Not set'}")
-    
-    print("\n✅ All tests completed!")
-    print("\n💡 Usage Examples:")
-    print("   # Use development environment:")
-    print("   uv run python -m main --app-env development")
-    print("")
-    print("   # Use SIT with custom AWS region:")
-    print("   uv run python -m main --app-env sit --aws-region ap-southeast-1")
-    print("")
-    print("   # Use production with all parameters:")
-    print("   uv run python -m main \\")
-    print("     --app-env production \\")
-    print("     --aws-region ap-southeast-1 \\")
-    print("     --aws-access-key-id AKIAXXXXXXXX \\")
-    print("     --aws-secret-access-key your_secret_key \\")
-    print("     --ai-agent-api-key your_ai_api_key")
+
+    assert settings.app_env == "prd"
+    assert settings.aws_region == "eu-west-1"
+    assert settings.ai_agent_api_key == "test_key_123"
+
+
+def test_create_settings_from_mapping(isolated_environ):
+    """An explicit env mapping is used as-is without loading .env files"""
+    settings = create_settings(
+        env={"APP_ENV": "sit", "AWS_REGION": "eu-west-1", "ALLOWED_ORIGINS": '["https://example.com"]'}
+    )
+
+    assert settings.app_env == "sit"
+    assert settings.aws_region == "eu-west-1"
+    assert settings.allowed_origins == ["https://example.com"]
+    assert settings.environment == "development"
+    assert "ENVIRONMENT" not in isolated_environ
+
+
+def test_create_settings_from_mapping_ignores_dotenv(tmp_path, monkeypatch):
+    """A .env file in the working directory does not leak into mapping-built settings"""
+    (tmp_path / ".env").write_text("ENVIRONMENT=staging\n")
+    monkeypatch.chdir(tmp_path)
+
+    settings = create_settings(env={"APP_ENV": "sit"})
+
+    assert settings.environment == "development"
+
+
+def test_create_settings_caches_per_environment(monkeypatch):
+    """Repeated calls reuse the validated Settings until the environment changes"""
+    _build_settings.cache_clear()
+    monkeypatch.setenv("APP_ENV", "development")
+
+    first = create_settings()
+    second = create_settings()
+    assert _build_settings.cache_info().hits == 1
+    assert second is not first
+
+    second.allowed_origins.append("https://example.com")
+    assert create_settings().allowed_origins == first.allowed_origins
+
+    monkeypatch.setenv("AWS_REGION", "ap-northeast-2")
+    changed = create_settings()
+    assert changed is not first
+    assert changed.aws_region == "ap-northeast-2"
+
+    _build_settings.cache_clear()
+
+
+def test_create_settings_reads_env_files_once(isolated_environ, capsys):
+    """Repeat loads reuse the parsed .env files and do not reprint the banner"""
+    create_settings()
+    capsys.readouterr()
+    misses = _read_env_file.cache_info().misses
+
+    create_settings()
+
+    assert _read_env_file.cache_info().misses == misses
+    assert capsys.readouterr().out == ""
+
 
 if __name__ == "__main__":
-    test_environment_loading()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))
\ No newline at end of file
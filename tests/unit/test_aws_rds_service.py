@@ -8,18 +8,124 @@ Tests for AWS RDS connection management including:
 - Credential resolution
 """
 
+import asyncio
+import threading
 import pytest
-from unittest.mock import Mock, patch, AsyncMock, MagicMock
+from unittest.mock import patch, MagicMock
 from botocore.exceptions import ClientError
 import json
 
+from src.compliance_agent.services import aws_rds_service
 from src.compliance_agent.services.aws_rds_service import (
     AWSSecretsManager,
     AWSRDSConfig,
-    RDSConnectionValidator
+    RDSConnectionValidator,
+    _CLIENT_CONFIG,
+    _build_client,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_secret_cache():
+    """Keep cached secrets, in-flight fetches and clients from leaking between tests"""
+    AWSSecretsManager.clear_cache()
+    _build_client.cache_clear()
+    yield
+    AWSSecretsManager.clear_cache()
+    _build_client.cache_clear()
+    # Fetches are bound to the test's event loop, which is closed by now
+    aws_rds_service._inflight_fetches.clear()
+
+
+SEEDED_SECRETS = {
+    "test-secret": {
+        "username": "db_user",
+        "password": "db_password",
+        "host": "rds.amazonaws.com",
+        "port": "5432"
+    },
+    "prod-db-credentials": {
+        "username": "prod_user",
+        "password": "prod_password"
+    },
+}
+
+
+# Serialized once and shared by tests that only need some valid secret payload
+SECRET_STRING = json.dumps({"username": "db_user"})
+
+
+def _make_client_error(code, operation='GetSecretValue'):
+    """Build the ClientError boto3 raises for a Secrets Manager error code"""
+    return ClientError({'Error': {'Code': code, 'Message': f'{code} raised'}}, operation)
+
+
+class SeededSecretsClient:
+    """In-process Secrets Manager client serving a fixed set of secrets"""
+    
+    def __init__(self, secrets):
+        # Serialize up front, as Secrets Manager stores the string form
+        self.secrets = {name: json.dumps(secret) for name, secret in secrets.items()}
+        self.requested = []
+        self.threads = []
+    
+    def get_secret_value(self, SecretId):
+        self.requested.append(SecretId)
+        self.threads.append(threading.get_ident())
+        if SecretId not in self.secrets:
+            raise _make_client_error('ResourceNotFoundException')
+        return {'SecretString': self.secrets[SecretId]}
+
+
+@pytest.fixture
+def secrets_client():
+    """Serve SEEDED_SECRETS through the real AWSSecretsManager code path"""
+    client = SeededSecretsClient(SEEDED_SECRETS)
+    with patch('src.compliance_agent.services.aws_rds_service._build_client', return_value=client):
+        yield client
+
+
+class _FakeSecretsManager:
+    """Stand-in for AWSSecretsManager that returns one fixed payload"""
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.regions = []
+        self.requested = []
+    
+    def __call__(self, region_name="ap-southeast-1"):
+        # Installed in place of the class, so construction returns this instance
+        self.regions.append(region_name)
+        return self
+    
+    async def get_secret(self, secret_name, use_cache=True):
+        self.requested.append(secret_name)
+        return dict(self.payload)
+
+
+@pytest.fixture
+def fake_secrets_manager(monkeypatch):
+    """Install a _FakeSecretsManager serving the given payload"""
+    def install(payload):
+        fake = _FakeSecretsManager(payload)
+        monkeypatch.setattr(aws_rds_service, 'AWSSecretsManager', fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def boto3_client_factory():
+    """Patch boto3.client once, returning a shared MagicMock client"""
+    with patch('boto3.client', return_value=MagicMock()) as factory:
+        yield factory
+
+
+@pytest.fixture
+def mock_boto3(boto3_client_factory):
+    """The MagicMock Secrets Manager client handed out by boto3.client"""
+    return boto3_client_factory.return_value
+
+
 class TestAWSSecretsManager:
     """Test AWS Secrets Manager client"""
     
@@ -34,97 +140,126 @@ class TestAWSSecretsManager:
         manager = AWSSecretsManager()
         assert manager.region_name == "ap-southeast-1"
     
-    @patch('boto3.client')
-    def test_get_client_creates_client(self, mock_boto_client):
+    def test_get_client_creates_client(self, boto3_client_factory, mock_boto3):
         """Test _get_client creates boto3 client"""
-        mock_client = MagicMock()
-        mock_boto_client.return_value = mock_client
-        
         manager = AWSSecretsManager(region_name="us-west-2")
         client = manager._get_client()
         
-        assert client == mock_client
-        mock_boto_client.assert_called_once_with(
+        assert client == mock_boto3
+        boto3_client_factory.assert_called_once_with(
             'secretsmanager',
-            region_name="us-west-2"
+            region_name="us-west-2",
+            config=_CLIENT_CONFIG
         )
+        assert _CLIENT_CONFIG.tcp_keepalive is True
+        assert _CLIENT_CONFIG.max_pool_connections == 50
     
-    @patch('boto3.client')
-    def test_get_client_reuses_existing_client(self, mock_boto_client):
+    def test_get_client_reuses_existing_client(self, boto3_client_factory):
         """Test _get_client reuses existing client"""
-        mock_client = MagicMock()
-        mock_boto_client.return_value = mock_client
-        
         manager = AWSSecretsManager()
         client1 = manager._get_client()
         client2 = manager._get_client()
+        client3 = AWSSecretsManager()._get_client()
         
-        assert client1 == client2
-        mock_boto_client.assert_called_once()
+        assert client1 == client2 == client3
+        boto3_client_factory.assert_called_once()
+    
+    def test_get_client_builds_one_client_per_region(self, boto3_client_factory):
+        """Test managers in different regions get separate clients"""
+        AWSSecretsManager(region_name="us-east-1")._get_client()
+        AWSSecretsManager(region_name="eu-west-1")._get_client()
+        
+        assert boto3_client_factory.call_count == 2
     
     @pytest.mark.asyncio
-    @patch('boto3.client')
-    async def test_get_secret_success(self, mock_boto_client):
+    async def test_get_secret_success(self, secrets_client):
         """Test successfully retrieving a secret"""
-        mock_client = MagicMock()
-        secret_data = {
-            "username": "db_user",
-            "password": "db_password",
-            "host": "rds.amazonaws.com",
-            "port": "5432"
-        }
-        mock_client.get_secret_value.return_value = {
-            'SecretString': json.dumps(secret_data)
-        }
-        mock_boto_client.return_value = mock_client
-        
         manager = AWSSecretsManager()
         result = await manager.get_secret("test-secret")
         
-        assert result == secret_data
-        mock_client.get_secret_value.assert_called_once_with(SecretId="test-secret")
+        assert result == SEEDED_SECRETS["test-secret"]
+        assert secrets_client.requested == ["test-secret"]
+        
+        # A second lookup, even from a new manager, is served from the cache
+        assert await AWSSecretsManager().get_secret("test-secret") == SEEDED_SECRETS["test-secret"]
+        assert secrets_client.requested == ["test-secret"]
     
     @pytest.mark.asyncio
-    @patch('boto3.client')
-    async def test_get_secret_decryption_failure(self, mock_boto_client):
-        """Test handling decryption failure"""
-        mock_client = MagicMock()
-        error_response = {'Error': {'Code': 'DecryptionFailureException', 'Message': 'Decryption failed'}}
-        mock_client.get_secret_value.side_effect = ClientError(error_response, 'GetSecretValue')
-        mock_boto_client.return_value = mock_client
+    async def test_get_secret_runs_off_event_loop(self, secrets_client):
+        """Test the blocking boto3 call runs in a worker thread"""
+        await AWSSecretsManager().get_secret("test-secret")
+        
+        assert secrets_client.threads
+        assert threading.get_ident() not in secrets_client.threads
+    
+    @pytest.mark.asyncio
+    async def test_get_secret_replaces_fetch_from_closed_loop(self, secrets_client):
+        """Test a fetch left pending by a closed loop is not awaited on another loop"""
+        other_loop = asyncio.new_event_loop()
+        stale = other_loop.create_future()
+        other_loop.close()
+        aws_rds_service._inflight_fetches[("ap-southeast-1", "test-secret")] = stale
+        
+        result = await asyncio.wait_for(AWSSecretsManager().get_secret("test-secret"), timeout=1)
+        
+        assert result == SEEDED_SECRETS["test-secret"]
+        assert secrets_client.requested == ["test-secret"]
+        assert aws_rds_service._inflight_fetches == {}
+    
+    @pytest.mark.asyncio
+    async def test_get_secret_cache_ttl_expiry(self, mock_boto3):
+        """Test cached secrets are refetched once the TTL has passed"""
+        mock_boto3.get_secret_value.return_value = {'SecretString': SECRET_STRING}
         
         manager = AWSSecretsManager()
+        with patch('src.compliance_agent.services.aws_rds_service.time.monotonic', return_value=1000.0):
+            await manager.get_secret("test-secret")
+        with patch('src.compliance_agent.services.aws_rds_service.time.monotonic', return_value=1299.0):
+            await manager.get_secret("test-secret")
+        assert mock_boto3.get_secret_value.call_count == 1
         
-        with pytest.raises(ClientError) as exc_info:
+        with patch('src.compliance_agent.services.aws_rds_service.time.monotonic', return_value=1301.0):
             await manager.get_secret("test-secret")
+        assert mock_boto3.get_secret_value.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_secret_bypasses_cache(self, mock_boto3):
+        """Test use_cache=False always calls Secrets Manager"""
+        mock_boto3.get_secret_value.return_value = {'SecretString': SECRET_STRING}
+        
+        manager = AWSSecretsManager()
+        await manager.get_secret("test-secret")
+        await manager.get_secret("test-secret", use_cache=False)
         
-        assert exc_info.value.response['Error']['Code'] == 'DecryptionFailureException'
+        assert mock_boto3.get_secret_value.call_count == 2
     
     @pytest.mark.asyncio
-    @patch('boto3.client')
-    async def test_get_secret_resource_not_found(self, mock_boto_client):
-        """Test handling when secret is not found"""
-        mock_client = MagicMock()
-        error_response = {'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Secret not found'}}
-        mock_client.get_secret_value.side_effect = ClientError(error_response, 'GetSecretValue')
-        mock_boto_client.return_value = mock_client
+    @pytest.mark.parametrize("error_code", [
+        'DecryptionFailureException',
+        'InternalServiceErrorException',
+        'InvalidParameterException',
+        'InvalidRequestException',
+        'ResourceNotFoundException',
+        'ThrottlingException',
+    ])
+    async def test_get_secret_client_errors(self, mock_boto3, error_code):
+        """Test Secrets Manager errors are re-raised and nothing is cached"""
+        mock_boto3.get_secret_value.side_effect = _make_client_error(error_code)
         
         manager = AWSSecretsManager()
         
         with pytest.raises(ClientError) as exc_info:
-            await manager.get_secret("nonexistent-secret")
+            await manager.get_secret("test-secret")
         
-        assert exc_info.value.response['Error']['Code'] == 'ResourceNotFoundException'
+        assert exc_info.value.response['Error']['Code'] == error_code
+        assert manager._get_cached("test-secret") is None
     
     @pytest.mark.asyncio
-    @patch('boto3.client')
-    async def test_get_secret_invalid_json(self, mock_boto_client):
+    async def test_get_secret_invalid_json(self, mock_boto3):
         """Test handling invalid JSON in secret"""
-        mock_client = MagicMock()
-        mock_client.get_secret_value.return_value = {
+        mock_boto3.get_secret_value.return_value = {
             'SecretString': 'not valid json {'
         }
-        mock_boto_client.return_value = mock_client
         
         manager = AWSSecretsManager()
         
@@ -154,6 +289,19 @@ class TestAWSRDSConfig:
         assert config['charset'] == 'utf8mb4'
         assert config['autocommit'] is True
     
+    def test_build_config_defaults_not_shared(self):
+        """Test editing one built config leaves later configs untouched"""
+        config = AWSRDSConfig.build_connection_config(
+            host="rds.amazonaws.com", port=5432, database="mydb", username="admin", password="secret123"
+        )
+        config['charset'] = 'latin1'
+        
+        fresh = AWSRDSConfig.build_connection_config(
+            host="rds.amazonaws.com", port=5432, database="mydb", username="admin", password="secret123"
+        )
+        assert fresh['charset'] == 'utf8mb4'
+        assert fresh['connect_timeout'] == 60
+    
     def test_build_config_with_secrets_manager(self):
         """Test building config with Secrets Manager"""
         config = AWSRDSConfig.build_connection_config(
@@ -216,17 +364,14 @@ class TestAWSRDSConfig:
         assert resolved['password'] == 'password'
     
     @pytest.mark.asyncio
-    @patch('src.compliance_agent.services.aws_rds_service.AWSSecretsManager')
-    async def test_resolve_credentials_with_secrets_manager(self, mock_secrets_class):
+    async def test_resolve_credentials_with_secrets_manager(self, fake_secrets_manager):
         """Test resolving credentials from Secrets Manager"""
-        mock_secrets_instance = AsyncMock()
-        mock_secrets_instance.get_secret.return_value = {
+        fake = fake_secrets_manager({
             'username': 'db_admin',
             'password': 'secret_pass',
             'host': 'new-rds.amazonaws.com',
             'port': '3307'
-        }
-        mock_secrets_class.return_value = mock_secrets_instance
+        })
         
         config = {
             'host': 'old-host.com',
@@ -246,6 +391,31 @@ class TestAWSRDSConfig:
         assert 'secret_name' not in resolved
         assert 'region' not in resolved
         assert 'use_secrets_manager' not in resolved
+        assert fake.regions == ['us-east-1']
+        assert fake.requested == ['my-secret']
+    
+    @pytest.mark.asyncio
+    async def test_resolve_credentials_numeric_port(self, fake_secrets_manager):
+        """Test a numeric port from Secrets Manager is used as-is"""
+        fake = fake_secrets_manager({
+            'username': 'db_admin',
+            'password': 'secret_pass',
+            'port': 3308
+        })
+        
+        config = {
+            'host': 'rds.amazonaws.com',
+            'port': 3306,
+            'db': 'mydb',
+            'secret_name': 'my-secret',
+            'use_secrets_manager': True
+        }
+        
+        resolved = await AWSRDSConfig.resolve_credentials(config)
+        
+        assert resolved['port'] == 3308
+        assert resolved['host'] == 'rds.amazonaws.com'
+        assert fake.regions == ['ap-southeast-1']  # Default region
     
     @pytest.mark.asyncio
     async def test_resolve_credentials_missing_secret_name(self):
@@ -263,16 +433,13 @@ class TestAWSRDSConfig:
         assert "secret_name" in str(exc_info.value).lower()
     
     @pytest.mark.asyncio
-    @patch('src.compliance_agent.services.aws_rds_service.AWSSecretsManager')
-    async def test_resolve_credentials_partial_secrets(self, mock_secrets_class):
+    async def test_resolve_credentials_partial_secrets(self, fake_secrets_manager):
         """Test resolving credentials when secrets don't include host/port"""
-        mock_secrets_instance = AsyncMock()
-        mock_secrets_instance.get_secret.return_value = {
+        fake = fake_secrets_manager({
             'username': 'db_admin',
             'password': 'secret_pass'
             # No host or port in secrets
-        }
-        mock_secrets_class.return_value = mock_secrets_instance
+        })
         
         config = {
             'host': 'original-host.com',
@@ -289,6 +456,7 @@ class TestAWSRDSConfig:
         assert resolved['password'] == 'secret_pass'
         assert resolved['host'] == 'original-host.com'  # Original host preserved
         assert resolved['port'] == 3306  # Original port preserved
+        assert fake.requested == ['my-secret']
 
 
 class TestRDSConnectionValidator:
@@ -420,6 +588,21 @@ class TestRDSConnectionValidator:
         
         assert "port" in str(exc_info.value).lower()
     
+    def test_validate_config_rejects_bool_port(self):
+        """Test validation fails when port is a bool rather than an int"""
+        config = {
+            'host': 'rds.amazonaws.com',
+            'port': True,
+            'db': 'mydb',
+            'user': 'admin',
+            'password': 'secret'
+        }
+        
+        with pytest.raises(ValueError) as exc_info:
+            RDSConnectionValidator.validate_config(config)
+        
+        assert "port" in str(exc_info.value).lower()
+    
     def test_validate_config_valid_port_boundaries(self):
         """Test validation succeeds with ports at valid boundaries"""
         # Test port 1
@@ -447,17 +630,8 @@ class TestIntegration:
     """Test integration scenarios"""
     
     @pytest.mark.asyncio
-    @patch('src.compliance_agent.services.aws_rds_service.AWSSecretsManager')
-    async def test_full_config_flow_with_secrets_manager(self, mock_secrets_class):
+    async def test_full_config_flow_with_secrets_manager(self, secrets_client):
         """Test complete flow from config build to credential resolution"""
-        # Mock secrets manager
-        mock_secrets_instance = AsyncMock()
-        mock_secrets_instance.get_secret.return_value = {
-            'username': 'prod_user',
-            'password': 'prod_password'
-        }
-        mock_secrets_class.return_value = mock_secrets_instance
-        
         # Build config
         config = AWSRDSConfig.build_connection_config(
             host="prod-rds.amazonaws.com",
@@ -482,6 +656,26 @@ class TestIntegration:
         assert resolved['password'] == 'prod_password'
         assert 'use_secrets_manager' not in resolved
         assert 'secret_name' not in resolved
+        assert secrets_client.requested == ["prod-db-credentials"]
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_resolutions_share_one_secret_fetch(self, secrets_client):
+        """Test concurrent credential resolution issues a single Secrets Manager call"""
+        config = AWSRDSConfig.build_connection_config(
+            host="prod-rds.amazonaws.com",
+            port=5432,
+            database="production_db",
+            secret_name="prod-db-credentials",
+            use_secrets_manager=True
+        )
+        
+        first, second = await asyncio.gather(
+            AWSRDSConfig.resolve_credentials(config),
+            AWSRDSConfig.resolve_credentials(config),
+        )
+        
+        assert first == second
+        assert secrets_client.requested == ["prod-db-credentials"]
     
     def test_full_config_flow_with_direct_credentials(self):
         """Test complete flow with direct credentials"""
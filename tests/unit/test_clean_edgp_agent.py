@@ -1,3 +1,5 @@
+import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 import pytest
@@ -5,11 +7,11 @@ import pytest
 from src.compliance_agent import clean_edgp_agent as agent_module
 
 
+@dataclass(slots=True)
 class _DBStub:
-    def __init__(self, customers=None):
-        self.customers = customers or []
-        self.initialized = False
-        self.closed = False
+    customers: list = field(default_factory=list)
+    initialized: bool = False
+    closed: bool = False
 
     async def initialize(self):
         self.initialized = True
@@ -27,6 +29,28 @@ class _AIAnalyzerStub:
         return True
 
 
+@dataclass(slots=True)
+class CustomerStub:
+    created_date: datetime
+    updated_date: datetime
+    id: int = 1
+    is_archived: bool = False
+    retention_period_years: int = 1
+    firstname: str = "Ada"
+    lastname: str = "Lovelace"
+    email: str = "ada@example.com"
+    phone: str = "1234"
+    domain_name: str = "example.com"
+
+    def dict(self):
+        return {"id": self.id}
+
+
+@dataclass(slots=True)
+class CustomerSimple:
+    is_archived: bool = False
+
+
 class _RemediationStub:
     def __init__(self):
         self.calls = []
@@ -36,17 +60,19 @@ class _RemediationStub:
         return True
 
 
-@pytest.fixture
-def agent(monkeypatch):
-    db_stub = _DBStub()
-    monkeypatch.setattr(agent_module, "EDGPDatabaseService", lambda: db_stub)
-    monkeypatch.setattr(agent_module, "AIComplianceAnalyzer", lambda: _AIAnalyzerStub())
-    monkeypatch.setattr(agent_module, "ComplianceRemediationService", lambda: _RemediationStub())
+@pytest.fixture(scope="module")
+def now():
+    # Naive local time, matching the datetime.now() clock the agent ages records against
+    return datetime.now()
+
 
-    compliance_agent = agent_module.CleanEDGPComplianceAgent()
-    compliance_agent.db_service = db_stub
-    compliance_agent.remediation_service = compliance_agent.remediation_service  # type: ignore[attr-defined]
-    return compliance_agent
+@pytest.fixture
+def agent():
+    return agent_module.CleanEDGPComplianceAgent(
+        db_service=_DBStub(),
+        ai_analyzer=_AIAnalyzerStub(),
+        remediation_service=_RemediationStub(),
+    )
 
 
 @pytest.mark.asyncio
@@ -56,25 +82,8 @@ async def test_agent_initialize_calls_database(agent):
 
 
 @pytest.mark.asyncio
-async def test_scan_customer_compliance_detects_violation(agent, monkeypatch):
-    class CustomerStub:
-        def __init__(self, created_days, updated_days, archived=False):
-            now = datetime.utcnow()
-            self.id = 1
-            self.created_date = now - timedelta(days=created_days)
-            self.updated_date = now - timedelta(days=updated_days)
-            self.is_archived = archived
-            self.retention_period_years = 1
-            self.firstname = "Ada"
-            self.lastname = "Lovelace"
-            self.email = "ada@example.com"
-            self.phone = "1234"
-            self.domain_name = "example.com"
-
-        def dict(self):
-            return {"id": self.id}
-
-    customer = CustomerStub(created_days=2000, updated_days=1900)
+async def test_scan_customer_compliance_detects_violation(agent, monkeypatch, now):
+    customer = CustomerStub(created_date=now - timedelta(days=2000), updated_date=now - timedelta(days=1900))
     agent.db_service.customers = [customer]
 
     async def fake_analysis(customer, data_age, retention_limit):
@@ -99,17 +108,43 @@ async def test_scan_customer_compliance_detects_violation(agent, monkeypatch):
     assert remediation_calls, "High severity violation should trigger remediation"
 
 
-def test_get_retention_limit(agent):
-    class CustomerSimple:
-        def __init__(self, archived=False):
-            self.is_archived = archived
+@pytest.mark.asyncio
+async def test_scan_customer_compliance_is_concurrent(agent, monkeypatch, now):
+    agent.db_service.customers = [
+        CustomerStub(id=index, created_date=now - timedelta(days=2000), updated_date=now - timedelta(days=1900))
+        for index in range(10)
+    ]
 
+    in_flight = peak = 0
+
+    async def slow_analysis(customer, data_age, retention_limit):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {"severity": "LOW", "description": "Over retention limit", "recommended_action": "Review"}
+
+    monkeypatch.setattr(agent, "_get_ai_violation_analysis", slow_analysis)
+
+    violations = await agent.scan_customer_compliance()
+
+    assert [violation.customer_id for violation in violations] == list(range(10))
+    assert 1 < peak <= agent.max_concurrent_analyses, "Analyses should overlap rather than run back to back"
+
+
+def test_get_retention_limit(agent):
     customer = CustomerSimple()
     limit = agent._get_retention_limit(customer, last_activity_age=100)
     assert limit == agent.retention_limits["customer_default"]
 
-    archived_customer = CustomerSimple(archived=True)
+    archived_customer = CustomerSimple(is_archived=True)
     assert agent._get_retention_limit(archived_customer, 10) == agent.retention_limits["deleted_customer"]
 
     inactive_customer = CustomerSimple()
     assert agent._get_retention_limit(inactive_customer, last_activity_age=800) == agent.retention_limits["inactive_customer"]
+
+
+def test_get_retention_limit_follows_updated_limits(agent):
+    agent.retention_limits["inactive_customer"] = 90
+    assert agent._get_retention_limit(CustomerSimple(), last_activity_age=800) == 90
@@ -2,7 +2,11 @@
 Comprehensive tests for compliance_utils module
 """
 
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
 from src.compliance_agent.utils.compliance_utils import (
     mask_pii_data,
     validate_consent_date,
@@ -36,6 +40,17 @@ def test_mask_pii_data_masks_id_numbers():
     assert ("***ID***" in result or "1234567890" not in result)
 
 
+def test_mask_pii_data_masks_mixed_text():
+    text = "Reach jane@example.org or 555 123 4567, ref 98765432"
+    result = mask_pii_data(text)
+    assert result == "Reach ***@***.*** or +***-***-****, ref +***-***-****"
+
+
+def test_mask_pii_data_email_takes_precedence_over_phone():
+    # The phone pattern must not claim the digit-led local part of an email
+    assert mask_pii_data("Tel 9123 4567 12@corp.com") == "Tel +***-***-**** ***@***.***"
+
+
 def test_validate_consent_date_valid():
     recent_date = (datetime.now() - timedelta(days=100)).isoformat()
     is_valid, message = validate_consent_date(recent_date, retention_days=365)
@@ -62,40 +77,55 @@ def test_validate_consent_date_with_timezone():
     assert is_valid is True or is_valid is False  # Accept either, main thing is it doesn't crash
 
 
-def test_detect_compliance_framework_pdpa():
-    data = {"country": "singapore"}
-    framework = detect_compliance_framework(data)
-    assert framework == "PDPA"
-
-
-def test_detect_compliance_framework_pdpa_region():
-    data = {"region": "apac"}
-    framework = detect_compliance_framework(data)
-    assert framework == "PDPA"
-
-
-def test_detect_compliance_framework_gdpr():
-    data = {"country": "germany"}
-    framework = detect_compliance_framework(data)
-    assert framework == "GDPR"
-
-
-def test_detect_compliance_framework_gdpr_region():
-    data = {"region": "eu"}
-    framework = detect_compliance_framework(data)
-    assert framework == "GDPR"
-
-
-def test_detect_compliance_framework_ccpa():
-    data = {"region": "california"}
-    framework = detect_compliance_framework(data)
-    assert framework == "CCPA"
+def test_validate_consent_date_utc_suffix():
+    recent_date = (datetime.now(timezone.utc) - timedelta(days=100)).isoformat().replace("+00:00", "Z")
+    is_valid, message = validate_consent_date(recent_date, retention_days=365)
+    assert is_valid is True
 
 
-def test_detect_compliance_framework_generic():
-    data = {"country": "unknown"}
-    framework = detect_compliance_framework(data)
-    assert framework == "Generic"
+def test_validate_consent_date_with_reference_time():
+    now = datetime(2024, 6, 1, 12, 0)
+    assert validate_consent_date("2024-01-01T12:00:00", retention_days=365, now=now)[0] is True
+    assert validate_consent_date("2023-01-01T12:00:00", retention_days=365, now=now) == (
+        False, "Consent expired 152 days ago"
+    )
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset to switch the local zone")
+def test_validate_consent_date_across_dst_change(monkeypatch):
+    # January to June crosses the March DST change; naive dates must still count whole days
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        now = datetime(2024, 6, 1, 12, 0)
+        assert validate_consent_date("2023-01-01T12:00:00", retention_days=365, now=now) == (
+            False, "Consent expired 152 days ago"
+        )
+        assert validate_consent_date("2023-06-02T12:00:00", retention_days=365, now=now)[0] is True
+        assert validate_consent_date("2024-01-01T17:00:00Z", retention_days=152, now=now)[0] is True
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"country": "singapore"}, "PDPA"),
+        ({"region": "apac"}, "PDPA"),
+        ({"country": "germany"}, "GDPR"),
+        ({"region": "eu"}, "GDPR"),
+        ({"region": "california"}, "CCPA"),
+        ({"country": "unknown"}, "Generic"),
+        # PDPA outranks GDPR, which outranks CCPA, whichever field implies them
+        ({"country": "Germany", "region": "APAC"}, "PDPA"),
+        ({"country": "usa", "region": "europe"}, "GDPR"),
+        # "ca" is only California as a region, not as a country code
+        ({"country": "ca"}, "Generic"),
+    ],
+)
+def test_detect_compliance_framework(data, expected):
+    assert detect_compliance_framework(data) == expected
 
 
 def test_generate_compliance_report_empty():
@@ -118,6 +148,13 @@ def test_generate_compliance_report_with_violations():
     assert report["severity_breakdown"]["medium"] == 1
 
 
+def test_generate_compliance_report_defaults_and_unknown_severity():
+    violations = [{}, {"type": "data_retention", "severity": "critical"}]
+    report = generate_compliance_report(violations)
+    assert report["violation_types"] == {"unknown": 1, "data_retention": 1}
+    assert report["severity_breakdown"] == {"high": 0, "medium": 1, "low": 0}
+
+
 def test_generate_compliance_report_recommendations():
     violations = [
         {"type": "expired_consent", "severity": "high"},
@@ -169,6 +206,30 @@ def test_sanitize_log_data_masks_pii_in_strings():
     assert "***@***.***" in sanitized["message"]
 
 
+def test_sanitize_log_data_matches_key_substrings():
+    data = {"API_Key": "abc", "user_phone_number": "555", "keyword": "x", "name": "john"}
+    sanitized = sanitize_log_data(data)
+    assert sanitized == {
+        "API_Key": "***MASKED***",
+        "user_phone_number": "***MASKED***",
+        "keyword": "***MASKED***",
+        "name": "john",
+    }
+
+
+def test_sanitize_log_data_deeply_nested():
+    data = leaf = {}
+    for _ in range(5000):
+        leaf["child"] = {}
+        leaf = leaf["child"]
+    leaf["password"] = "secret"
+
+    sanitized = sanitize_log_data(data)
+    for _ in range(5000):
+        sanitized = sanitized["child"]
+    assert sanitized == {"password": "***MASKED***"}
+
+
 def test_calculate_retention_expiry_valid_date():
     created_date = "2023-01-01T00:00:00"
     expiry = calculate_retention_expiry(created_date, 365)
@@ -188,7 +249,7 @@ def test_calculate_retention_expiry_invalid_date():
 def test_calculate_retention_expiry_with_timezone():
     created_date = "2023-01-01T00:00:00Z"
     expiry = calculate_retention_expiry(created_date, 365)
-    assert expiry is not None
+    assert expiry == "2024-01-01T00:00:00+00:00"
 
 
 def test_validate_data_structure_all_fields_present():
@@ -216,6 +277,14 @@ def test_validate_data_structure_empty_values():
     assert "age" in missing
 
 
+def test_validate_data_structure_keeps_falsy_values():
+    # Only None and "" count as missing; zero, False and empty containers are real values
+    data = {"count": 0, "active": False, "tags": []}
+    is_valid, missing = validate_data_structure(data, ["count", "active", "tags", "name", "count"])
+    assert is_valid is False
+    assert missing == ["name"]
+
+
 def test_format_compliance_timestamp_default():
     timestamp = format_compliance_timestamp()
     assert timestamp is not None
@@ -229,6 +298,14 @@ def test_format_compliance_timestamp_custom():
     assert "2023-01-01" in timestamp
 
 
+def test_format_compliance_timestamp_round_trips():
+    # Full precision and any offset are kept, so audit entries stay orderable
+    stamped = datetime(2023, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    timestamp = format_compliance_timestamp(stamped)
+    assert timestamp == "2023-01-01T12:00:00.123456+00:00"
+    assert datetime.fromisoformat(timestamp) == stamped
+
+
 def test_parse_configuration_defaults():
     config = parse_configuration({})
     assert config["retention_days"] == 365
@@ -6,6 +6,7 @@ Target: src/compliance_agent/services/edgp_database_service_simple.py
 
 import pytest
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 import aiomysql
 
@@ -15,16 +16,41 @@ from src.compliance_agent.services.edgp_database_service_simple import (
 )
 
 
-class AsyncContextManagerMock:
-    """Helper class to mock async context managers like pool.acquire()"""
-    def __init__(self, return_value):
-        self.return_value = return_value
-    
-    async def __aenter__(self):
-        return self.return_value
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        return None
+# Read-only local MySQL config shared by the initialization tests
+_LOCAL_CONFIG = MappingProxyType({
+    'host': 'localhost',
+    'port': 3306,
+    'user': 'testuser',
+    'password': 'testpass',
+    'db': 'testdb',
+    'charset': 'utf8mb4',
+    'autocommit': True
+})
+
+
+@pytest.fixture
+def service():
+    """Fresh service per test; tests attach pools and flags to it"""
+    return EDGPDatabaseService()
+
+
+def make_pool_mock(fetchone=(1,), fetchall=None, maxsize=5):
+    """Build a pool whose acquire()/cursor() context managers yield a shared cursor"""
+    mock_cursor = AsyncMock()
+    mock_cursor.fetchone = AsyncMock(return_value=fetchone)
+    mock_cursor.fetchall = AsyncMock(return_value=fetchall if fetchall is not None else [])
+    mock_cursor.__aenter__.return_value = mock_cursor
+    mock_cursor.__aexit__.return_value = None
+
+    mock_conn = AsyncMock()
+    mock_conn.cursor = MagicMock(return_value=mock_cursor)
+
+    mock_pool = AsyncMock()
+    mock_pool.acquire = MagicMock()
+    # MagicMock supports async with natively; __aenter__ is an AsyncMock
+    mock_pool.acquire.return_value.__aenter__.return_value = mock_conn
+    mock_pool.maxsize = maxsize
+    return mock_pool, mock_conn, mock_cursor
 
 
 class TestCustomerData:
@@ -90,85 +116,89 @@ class TestBuildConnectionConfig:
     """Test _build_connection_config method"""
     
     @pytest.mark.asyncio
-    async def test_build_config_local_mysql(self):
-        """Test building config for local MySQL"""
-        service = EDGPDatabaseService()
-        
+    @pytest.mark.parametrize(
+        "overrides, expected",
+        [
+            (
+                {
+                    'edgp_db_host': 'localhost',
+                    'edgp_db_port': 3306,
+                    'edgp_db_username': 'testuser',
+                    'edgp_db_password': 'testpass',
+                    'edgp_db_name': 'testdb',
+                    'aws_rds_enabled': False,
+                    'aws_secrets_manager_enabled': False,
+                    'aws_rds_secret_name': None,
+                    'aws_rds_database': None,
+                },
+                dict(_LOCAL_CONFIG),
+            ),
+            (
+                {
+                    'edgp_db_host': None,
+                    'edgp_db_port': 3306,
+                    'edgp_db_username': 'testuser',
+                    'edgp_db_password': 'testpass',
+                    'edgp_db_name': 'testdb',
+                    'aws_rds_enabled': False,
+                    'aws_secrets_manager_enabled': False,
+                },
+                {'host': 'localhost'},
+            ),
+        ],
+        ids=["local_mysql", "local_default_host"],
+    )
+    async def test_build_config_local(self, service, overrides, expected):
+        """Test building local MySQL config"""
         with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings:
-            mock_settings.edgp_db_host = 'localhost'
-            mock_settings.edgp_db_port = 3306
-            mock_settings.edgp_db_username = 'testuser'
-            mock_settings.edgp_db_password = 'testpass'
-            mock_settings.edgp_db_name = 'testdb'
-            mock_settings.aws_rds_enabled = False
-            mock_settings.aws_secrets_manager_enabled = False
-            mock_settings.aws_rds_secret_name = None
-            mock_settings.aws_rds_database = None
+            for name, value in overrides.items():
+                setattr(mock_settings, name, value)
             
             config = await service._build_connection_config()
             
-            assert config['host'] == 'localhost'
-            assert config['port'] == 3306
-            assert config['user'] == 'testuser'
-            assert config['password'] == 'testpass'
-            assert config['db'] == 'testdb'
-            assert config['charset'] == 'utf8mb4'
-            assert config['autocommit'] is True
+            assert {key: config[key] for key in expected} == expected
             assert service.is_aws_rds is False
     
     @pytest.mark.asyncio
-    async def test_build_config_local_default_host(self):
-        """Test building config with default localhost"""
-        service = EDGPDatabaseService()
-        
-        with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings:
-            mock_settings.edgp_db_host = None
-            mock_settings.edgp_db_port = 3306
-            mock_settings.edgp_db_username = 'testuser'
-            mock_settings.edgp_db_password = 'testpass'
-            mock_settings.edgp_db_name = 'testdb'
-            mock_settings.aws_rds_enabled = False
-            mock_settings.aws_secrets_manager_enabled = False
-            
-            config = await service._build_connection_config()
-            
-            assert config['host'] == 'localhost'
-            assert service.is_aws_rds is False
-    
-    @pytest.mark.asyncio
-    async def test_build_config_missing_database_name(self):
-        """Test error when database name is missing"""
-        service = EDGPDatabaseService()
-        
-        with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings:
-            mock_settings.edgp_db_name = None
-            mock_settings.aws_rds_database = None
-            mock_settings.aws_rds_enabled = False
-            
-            with pytest.raises(ValueError, match="EDGP_DB_NAME is required"):
-                await service._build_connection_config()
-    
-    @pytest.mark.asyncio
-    async def test_build_config_missing_local_credentials(self):
-        """Test error when local credentials are missing"""
-        service = EDGPDatabaseService()
-        
+    @pytest.mark.parametrize(
+        "overrides, error, message",
+        [
+            (
+                {
+                    'edgp_db_name': None,
+                    'aws_rds_database': None,
+                    'aws_rds_enabled': False,
+                },
+                ValueError,
+                "EDGP_DB_NAME is required",
+            ),
+            (
+                {
+                    'edgp_db_host': 'localhost',
+                    'edgp_db_name': 'testdb',
+                    'edgp_db_username': None,
+                    'edgp_db_password': None,
+                    'aws_rds_enabled': False,
+                    'aws_secrets_manager_enabled': False,
+                },
+                Exception,
+                "Missing username or password",
+            ),
+        ],
+        ids=["missing_database_name", "missing_local_credentials"],
+    )
+    async def test_build_config_local_invalid(self, service, overrides, error, message):
+        """Test local MySQL config validation errors"""
         with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings:
-            mock_settings.edgp_db_host = 'localhost'
-            mock_settings.edgp_db_name = 'testdb'
-            mock_settings.edgp_db_username = None
-            mock_settings.edgp_db_password = None
-            mock_settings.aws_rds_enabled = False
-            mock_settings.aws_secrets_manager_enabled = False
+            for name, value in overrides.items():
+                setattr(mock_settings, name, value)
             
-            with pytest.raises(Exception, match="Missing username or password"):
+            with pytest.raises(error, match=message):
                 await service._build_connection_config()
     
     @pytest.mark.asyncio
-    async def test_build_config_aws_rds_with_secrets_manager(self):
+    async def test_build_config_aws_rds_with_secrets_manager(self, service):
         """Test building config for AWS RDS with Secrets Manager"""
-        service = EDGPDatabaseService()
-        
         with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings, \
              patch('src.compliance_agent.services.edgp_database_service_simple.AWSRDSConfig') as mock_rds_config:
             
@@ -199,10 +229,8 @@ class TestBuildConnectionConfig:
             assert config['db'] == 'proddb'
     
     @pytest.mark.asyncio
-    async def test_build_config_aws_rds_secrets_manager_error(self):
+    async def test_build_config_aws_rds_secrets_manager_error(self, service):
         """Test error handling when Secrets Manager fails"""
-        service = EDGPDatabaseService()
-        
         with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings, \
              patch('src.compliance_agent.services.edgp_database_service_simple.AWSRDSConfig') as mock_rds_config:
             
@@ -224,10 +252,8 @@ class TestBuildConnectionConfig:
             assert service.is_aws_rds is False
     
     @pytest.mark.asyncio
-    async def test_build_config_aws_rds_direct_credentials(self):
+    async def test_build_config_aws_rds_direct_credentials(self, service):
         """Test AWS RDS with direct credentials (no Secrets Manager)"""
-        service = EDGPDatabaseService()
-        
         with patch('src.compliance_agent.services.edgp_database_service_simple.settings') as mock_settings, \
              patch('src.compliance_agent.services.edgp_database_service_simple.AWSRDSConfig') as mock_rds_config, \
              patch('src.compliance_agent.services.edgp_database_service_simple.RDSConnectionValidator'):
@@ -265,59 +291,29 @@ class TestDatabaseInitialization:
     """Test initialize method"""
     
     @pytest.mark.asyncio
-    async def test_initialize_success(self):
+    async def test_initialize_success(self, service):
         """Test successful database initialization"""
-        service = EDGPDatabaseService()
-        
-        mock_config = {
-            'host': 'localhost',
-            'port': 3306,
-            'user': 'testuser',
-            'password': 'testpass',
-            'db': 'testdb',
-            'charset': 'utf8mb4',
-            'autocommit': True
-        }
-        
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        # Setup cursor to return success for test query
-        mock_cursor.fetchone = AsyncMock(return_value=(1,))
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        mock_pool, _, _ = make_pool_mock()
         
-        with patch.object(service, '_build_connection_config', return_value=mock_config), \
+        with patch.object(service, '_build_connection_config', return_value=_LOCAL_CONFIG), \
              patch('src.compliance_agent.services.edgp_database_service_simple.aiomysql.create_pool', 
                    return_value=mock_pool):
             
             await service.initialize()
             
-            assert service.connection_config == mock_config
+            assert service.connection_config == _LOCAL_CONFIG
             assert service.pool == mock_pool
     
     @pytest.mark.asyncio
-    async def test_initialize_no_config(self):
+    async def test_initialize_no_config(self, service):
         """Test initialization fails when config is None"""
-        service = EDGPDatabaseService()
-        
         with patch.object(service, '_build_connection_config', return_value=None):
             with pytest.raises(Exception, match="No valid connection configuration"):
                 await service.initialize()
     
     @pytest.mark.asyncio
-    async def test_initialize_connection_failure(self):
+    async def test_initialize_connection_failure(self, service):
         """Test initialization fails on connection error"""
-        service = EDGPDatabaseService()
-        
         mock_config = {
             'host': 'localhost',
             'port': 3306,
@@ -334,27 +330,12 @@ class TestDatabaseInitialization:
                 await service.initialize()
     
     @pytest.mark.asyncio
-    async def test_initialize_aws_rds_larger_pool(self):
+    async def test_initialize_aws_rds_larger_pool(self, service):
         """Test AWS RDS uses larger connection pool"""
-        service = EDGPDatabaseService()
         service.is_aws_rds = True
         
         mock_config = {'host': 'rds.amazonaws.com', 'db': 'proddb'}
-        mock_pool = AsyncMock()
-        mock_pool.maxsize = 10
-        
-        # Setup mock for test connection
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        mock_cursor.fetchone = AsyncMock(return_value=(1,))
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
+        mock_pool, _, _ = make_pool_mock(maxsize=10)
         
         with patch.object(service, '_build_connection_config', return_value=mock_config), \
              patch('src.compliance_agent.services.edgp_database_service_simple.aiomysql.create_pool',
@@ -371,23 +352,9 @@ class TestTestConnection:
     """Test _test_connection method"""
     
     @pytest.mark.asyncio
-    async def test_test_connection_success(self):
+    async def test_test_connection_success(self, service):
         """Test successful connection test"""
-        service = EDGPDatabaseService()
-        
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.fetchone = AsyncMock(return_value=(1,))
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
+        mock_pool, _, mock_cursor = make_pool_mock()
         service.pool = mock_pool
         
         await service._test_connection()
@@ -395,32 +362,17 @@ class TestTestConnection:
         mock_cursor.execute.assert_called_once_with("SELECT 1")
     
     @pytest.mark.asyncio
-    async def test_test_connection_no_pool(self):
+    async def test_test_connection_no_pool(self, service):
         """Test connection test returns early if no pool"""
-        service = EDGPDatabaseService()
         service.pool = None
         
         # Should not raise error, just return
         await service._test_connection()
     
     @pytest.mark.asyncio
-    async def test_test_connection_query_failure(self):
+    async def test_test_connection_query_failure(self, service):
         """Test connection test fails on query error"""
-        service = EDGPDatabaseService()
-        
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.fetchone = AsyncMock(return_value=(0,))  # Wrong result
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
+        mock_pool, _, _ = make_pool_mock(fetchone=(0,))  # Wrong result
         service.pool = mock_pool
         
         with pytest.raises(Exception, match="Database test query failed"):
@@ -431,10 +383,8 @@ class TestGetCustomers:
     """Test get_customers method"""
     
     @pytest.mark.asyncio
-    async def test_get_customers_success(self):
+    async def test_get_customers_success(self, service):
         """Test retrieving customers from database"""
-        service = EDGPDatabaseService()
-        
         now = datetime.utcnow()
         mock_rows = [
             (1, 'john@example.com', '+65-1234', 'John', 'Doe', 
@@ -443,20 +393,7 @@ class TestGetCustomers:
              now, now, False, 'test.com', 'WF-002'),
         ]
         
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.fetchall = AsyncMock(return_value=mock_rows)
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        mock_pool, _, _ = make_pool_mock(fetchall=mock_rows)
         service.pool = mock_pool
         service.connection_config = {'host': 'localhost', 'db': 'testdb'}
         
@@ -470,24 +407,9 @@ class TestGetCustomers:
         assert customers[1].email == 'jane@test.com'
     
     @pytest.mark.asyncio
-    async def test_get_customers_empty_result(self):
+    async def test_get_customers_empty_result(self, service):
         """Test retrieving when no customers exist"""
-        service = EDGPDatabaseService()
-        
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.fetchall = AsyncMock(return_value=[])
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        mock_pool, _, _ = make_pool_mock(fetchall=[])
         service.pool = mock_pool
         service.connection_config = {'host': 'localhost', 'db': 'testdb'}
         
@@ -496,33 +418,18 @@ class TestGetCustomers:
         assert len(customers) == 0
     
     @pytest.mark.asyncio
-    async def test_get_customers_no_pool(self):
+    async def test_get_customers_no_pool(self, service):
         """Test error when no database pool available"""
-        service = EDGPDatabaseService()
         service.pool = None
         
         with pytest.raises(Exception, match="No database connection available"):
             await service.get_customers()
     
     @pytest.mark.asyncio
-    async def test_get_customers_query_failure(self):
+    async def test_get_customers_query_failure(self, service):
         """Test error handling on query failure"""
-        service = EDGPDatabaseService()
-        
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.execute = AsyncMock(side_effect=Exception("Query failed"))
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        mock_pool, _, mock_cursor = make_pool_mock()
+        mock_cursor.execute.side_effect = Exception("Query failed")
         service.pool = mock_pool
         service.connection_config = {'host': 'localhost', 'db': 'testdb'}
         
@@ -530,29 +437,14 @@ class TestGetCustomers:
             await service.get_customers()
     
     @pytest.mark.asyncio
-    async def test_get_customers_with_nulls(self):
+    async def test_get_customers_with_nulls(self, service):
         """Test handling of NULL values in customer data"""
-        service = EDGPDatabaseService()
-        
         now = datetime.utcnow()
         mock_rows = [
             (1, None, None, None, None, now, now, None, None, None),
         ]
         
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        mock_cursor.fetchall = AsyncMock(return_value=mock_rows)
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        mock_pool, _, _ = make_pool_mock(fetchall=mock_rows)
         service.pool = mock_pool
         service.connection_config = {'host': 'localhost', 'db': 'testdb'}
         
@@ -568,18 +460,14 @@ class TestGetCustomers:
 class TestMockCustomers:
     """Test _get_mock_customers method"""
     
-    def test_get_mock_customers_count(self):
+    def test_get_mock_customers_count(self, service):
         """Test mock customers generation returns expected count"""
-        service = EDGPDatabaseService()
-        
         mock_customers = service._get_mock_customers()
         
         assert len(mock_customers) == 5
     
-    def test_get_mock_customers_data_quality(self):
+    def test_get_mock_customers_data_quality(self, service):
         """Test mock customers have valid data"""
-        service = EDGPDatabaseService()
-        
         mock_customers = service._get_mock_customers()
         
         for customer in mock_customers:
@@ -592,20 +480,16 @@ class TestMockCustomers:
             assert customer.updated_date is not None
             assert isinstance(customer.is_archived, bool)
     
-    def test_get_mock_customers_archived_data(self):
+    def test_get_mock_customers_archived_data(self, service):
         """Test mock customers include archived record"""
-        service = EDGPDatabaseService()
-        
         mock_customers = service._get_mock_customers()
         
         # Should have at least one archived customer
         archived_customers = [c for c in mock_customers if c.is_archived]
         assert len(archived_customers) > 0
     
-    def test_get_mock_customers_various_ages(self):
+    def test_get_mock_customers_various_ages(self, service):
         """Test mock customers have various creation dates"""
-        service = EDGPDatabaseService()
-        
         mock_customers = service._get_mock_customers()
         
         # Customers should have different ages
@@ -618,10 +502,8 @@ class TestClose:
     """Test close method"""
     
     @pytest.mark.asyncio
-    async def test_close_with_pool(self):
+    async def test_close_with_pool(self, service):
         """Test closing database connections"""
-        service = EDGPDatabaseService()
-        
         mock_pool = AsyncMock()
         mock_pool.close = MagicMock()
         mock_pool.wait_closed = AsyncMock()
@@ -634,9 +516,8 @@ class TestClose:
         mock_pool.wait_closed.assert_called_once()
     
     @pytest.mark.asyncio
-    async def test_close_without_pool(self):
+    async def test_close_without_pool(self, service):
         """Test close when no pool exists"""
-        service = EDGPDatabaseService()
         service.pool = None
         
         # Should not raise error
@@ -647,48 +528,20 @@ class TestIntegration:
     """Integration tests for full workflow"""
     
     @pytest.mark.asyncio
-    async def test_full_lifecycle_local_mysql(self):
+    async def test_full_lifecycle_local_mysql(self, service):
         """Test complete workflow with local MySQL"""
-        service = EDGPDatabaseService()
-        
-        mock_config = {
-            'host': 'localhost',
-            'port': 3306,
-            'user': 'testuser',
-            'password': 'testpass',
-            'db': 'testdb',
-            'charset': 'utf8mb4',
-            'autocommit': True
-        }
-        
         now = datetime.utcnow()
         mock_rows = [
             (1, 'test@example.com', '+65-1234', 'Test', 'User',
              now, now, False, 'example.com', 'WF-001'),
         ]
         
-        mock_pool = AsyncMock()
-        mock_conn = AsyncMock()
-        mock_cursor = AsyncMock()
-        
-        # Setup for test connection
-        mock_cursor.fetchone = AsyncMock(return_value=(1,))
-        # Setup for get customers
-        mock_cursor.fetchall = AsyncMock(return_value=mock_rows)
-        
-        mock_conn.cursor = MagicMock(return_value=mock_cursor)
-        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
-        mock_conn.__aexit__ = AsyncMock(return_value=None)
-        mock_cursor.__aenter__ = AsyncMock(return_value=mock_cursor)
-        mock_cursor.__aexit__ = AsyncMock(return_value=None)
-        
-        # Use AsyncContextManagerMock for pool.acquire()
-        mock_pool.acquire = MagicMock(return_value=AsyncContextManagerMock(mock_conn))
-        mock_pool.maxsize = 5
+        # fetchone serves the connection test, fetchall the customer query
+        mock_pool, _, _ = make_pool_mock(fetchall=mock_rows)
         mock_pool.close = MagicMock()
         mock_pool.wait_closed = AsyncMock()
         
-        with patch.object(service, '_build_connection_config', return_value=mock_config), \
+        with patch.object(service, '_build_connection_config', return_value=_LOCAL_CONFIG), \
              patch('src.compliance_agent.services.edgp_database_service_simple.aiomysql.create_pool',
                    return_value=mock_pool):
             
@@ -96,6 +96,26 @@ class TestComplianceModels:
         assert len(violation.remediation_actions) == 2
         assert isinstance(violation.detected_at, datetime)
     
+    def test_compliance_violation_aliases_default_to_rule_id(self):
+        """Test id and violation_id fall back to the rule id when missing or empty"""
+        violation = ComplianceViolation(
+            rule_id="pdpa_consent_001",
+            id=None,
+            description="No consent mechanism implemented",
+            risk_level="high"
+        )
+        
+        assert violation.id == "pdpa_consent_001"
+        assert violation.violation_id == "pdpa_consent_001"
+        assert violation.risk_level == RiskLevel.HIGH
+    
+    def test_data_processing_activity_defaults(self):
+        """Test retention period and legal bases get defaults when omitted"""
+        activity = DataProcessingActivity(id="a1", name="Test", purpose="Testing", legal_bases=[])
+        
+        assert activity.retention_period == 0
+        assert activity.legal_bases == ["unspecified"]
+    
     def test_compliance_assessment_creation(self):
         """Test ComplianceAssessment model creation"""
         activity = DataProcessingActivity(